@@ -290,12 +290,14 @@ class Tree:
         16
         17
         """
-        queue = [self]
         if not self.is_empty():
-            while len(queue) > 0:
-                act(queue[0])
-                queue.extend(queue[0]._subtrees)
-                queue.pop(0)
+            queue = Queue()
+            queue.enqueue(self)
+            while not queue.is_empty():
+                tree = queue.dequeue()
+                act(tree)
+                for subtree in tree._subtrees:
+                    queue.enqueue(subtree)
         return None
 
 
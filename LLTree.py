@@ -13,6 +13,8 @@ class Tree:
 
 
 class LLNode:
+    __slots__ = ('item', 'next')
+
     def __init__(self, item: object, next: 'LLNode' = None):
         self.item, self.next = item, next
 
@@ -0,0 +1,443 @@
+"""Least recently and least frequently used caches
+
+=== Module Description ===
+This module contains LRUCache and LFUCache, which keep the values of a
+bounded number of keys, and the cached decorator, which uses either of them
+to remember the results of a function.
+
+Both caches map each key to a node of a doubly.DoublyLinkedList, so
+looking a key up, moving it to its new place and evicting the right entry
+all take O(1) time. An LRUCache keeps one list, in order of use. An
+LFUCache keeps one list per use count, and a list of those lists in order
+of use count, so even the least frequently used entry is found without a
+search.
+"""
+import functools
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from doubly import DoublyLinkedList, _Node
+
+
+class _Entry:
+    """A key and its value, as stored in the lists of a cache.
+
+    === Attributes ===
+    key:
+        The key of this entry.
+    value:
+        The value of this entry.
+    weight:
+        The weight of the value, as given by the cache's weigher.
+    expires:
+        The clock time at which this entry expires, or None if it never
+        does.
+    bucket:
+        In an LFUCache, the node of the _Bucket this entry is in; otherwise
+        None.
+    """
+    __slots__ = ('key', 'value', 'weight', 'expires', 'bucket')
+    key: Hashable
+    value: Any
+    weight: float
+    expires: Optional[float]
+    bucket: Optional[_Node]
+
+    def __init__(self, key: Hashable, value: Any, weight: float,
+                 expires: Optional[float]) -> None:
+        """Initialize a new entry.
+        """
+        self.key = key
+        self.value = value
+        self.weight = weight
+        self.expires = expires
+        self.bucket = None
+
+
+class _Cache:
+    """The parts of LRUCache and LFUCache that do not depend on which entry
+    is evicted.
+
+    A cache holds at most <max_size> entries (if <max_size> is not None),
+    whose weights add up to at most <max_weight> (if <max_weight> is not
+    None). The weight of a value is weigher(value), or 1 if <weigher> is
+    None. An entry expires <ttl> seconds, as measured by <clock>, after it
+    was put (if <ttl> is not None); expired entries are dropped when they
+    are next looked up.
+
+    === Attributes ===
+    hits:
+        The number of lookups that found a value.
+    misses:
+        The number of lookups that did not, including those that found an
+        expired entry.
+    evictions:
+        The number of entries dropped to make room, or because they expired.
+    """
+    # === Private Attributes ===
+    # _nodes:
+    #     Maps each key to the node of its _Entry.
+    # _weight:
+    #     The total weight of the entries.
+    hits: int
+    misses: int
+    evictions: int
+    _max_size: Optional[int]
+    _max_weight: Optional[float]
+    _weigher: Optional[Callable[[Any], float]]
+    _ttl: Optional[float]
+    _clock: Callable[[], float]
+    _nodes: Dict[Hashable, _Node]
+    _weight: float
+
+    def __init__(self, max_size: Optional[int] = 128,
+                 max_weight: Optional[float] = None,
+                 weigher: Optional[Callable[[Any], float]] = None,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize a new empty cache.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._max_size = max_size
+        self._max_weight = max_weight
+        self._weigher = weigher
+        self._ttl = ttl
+        self._clock = clock
+        self._nodes = {}
+        self._weight = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries in this cache, including any that
+        have expired but not been dropped yet.
+        """
+        return len(self._nodes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return whether <key> has an unexpired value in this cache.
+
+        This does not count as a use of the key.
+        """
+        node = self._nodes.get(key)
+        return node is not None and not self._expired(node.item)
+
+    def weight(self) -> float:
+        """Return the total weight of the entries in this cache.
+        """
+        return self._weight
+
+    def hit_ratio(self) -> float:
+        """Return the fraction of lookups that were hits, or 0.0 if there
+        have been none.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value of <key>, and count it as used; or return
+        <default> if <key> has no unexpired value in this cache.
+        """
+        node = self._nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        entry = node.item
+        if self._expired(entry):
+            self._discard(node)
+            self.evictions += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(node)
+        return entry.value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Set the value of <key> to <value>, and count it as used.
+
+        Entries are evicted until the new value fits. A value heavier than
+        max_weight on its own is not stored at all.
+        """
+        weight = 1 if self._weigher is None else self._weigher(value)
+        if self._max_weight is not None and weight > self._max_weight:
+            self.pop(key)
+            return
+        expires = None if self._ttl is None else self._clock() + self._ttl
+        node = self._nodes.get(key)
+        if node is not None:
+            entry = node.item
+            self._weight += weight - entry.weight
+            entry.value = value
+            entry.weight = weight
+            entry.expires = expires
+            self._touch(node)
+            self._make_room(0, 0)
+        else:
+            self._make_room(1, weight)
+            self._nodes[key] = self._add(_Entry(key, value, weight, expires))
+            self._weight += weight
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove <key> from this cache, and return its value, or <default>
+        if <key> has no unexpired value in this cache.
+        """
+        node = self._nodes.get(key)
+        if node is None:
+            return default
+        self._discard(node)
+        return default if self._expired(node.item) else node.item.value
+
+    def clear(self) -> None:
+        """Remove every entry from this cache. The counters are kept.
+        """
+        for node in list(self._nodes.values()):
+            self._discard(node)
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry from this cache, and return how many
+        there were.
+
+        This takes O(n) time; expired entries are otherwise only dropped
+        when they are looked up or evicted.
+        """
+        expired = [node for node in self._nodes.values()
+                   if self._expired(node.item)]
+        for node in expired:
+            self._discard(node)
+        self.evictions += len(expired)
+        return len(expired)
+
+    def _expired(self, entry: _Entry) -> bool:
+        """Return whether <entry> has expired.
+        """
+        return entry.expires is not None and entry.expires <= self._clock()
+
+    def _make_room(self, size: int, weight: float) -> None:
+        """Evict entries until another <size> entries of total weight
+        <weight> fit in this cache.
+        """
+        while self._nodes and (
+                (self._max_size is not None
+                 and len(self._nodes) + size > self._max_size) or
+                (self._max_weight is not None
+                 and self._weight + weight > self._max_weight)):
+            self._discard(self._victim())
+            self.evictions += 1
+
+    def _discard(self, node: _Node) -> None:
+        """Remove the entry of <node> from this cache.
+        """
+        entry = node.item
+        self._remove(node)
+        del self._nodes[entry.key]
+        self._weight -= entry.weight
+
+    def _add(self, entry: _Entry) -> _Node:
+        """Link <entry>, which is new and used once, into the lists of this
+        cache, and return its node.
+        """
+        raise NotImplementedError
+
+    def _touch(self, node: _Node) -> None:
+        """Count the entry of <node> as used once more.
+        """
+        raise NotImplementedError
+
+    def _remove(self, node: _Node) -> None:
+        """Unlink <node> from the lists of this cache.
+        """
+        raise NotImplementedError
+
+    def _victim(self) -> _Node:
+        """Return the node of the entry to evict next.
+
+        Precondition: this cache is not empty.
+        """
+        raise NotImplementedError
+
+
+class LRUCache(_Cache):
+    """A cache that evicts the least recently used entry first.
+
+    >>> cache = LRUCache(max_size=2)
+    >>> cache.put('a', 1)
+    >>> cache.put('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.put('c', 3)  # 'b' is the least recently used
+    >>> 'b' in cache, cache.get('c'), cache.get('b', 'missing')
+    (False, 3, 'missing')
+    >>> cache.hits, cache.misses, cache.evictions
+    (2, 1, 1)
+    """
+    # === Private Attributes ===
+    # _order:
+    #     The entries, most recently used first.
+    _order: DoublyLinkedList
+
+    def __init__(self, max_size: Optional[int] = 128,
+                 max_weight: Optional[float] = None,
+                 weigher: Optional[Callable[[Any], float]] = None,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize a new empty cache.
+        """
+        _Cache.__init__(self, max_size, max_weight, weigher, ttl, clock)
+        self._order = DoublyLinkedList([])
+
+    def _add(self, entry: _Entry) -> _Node:
+        return self._order.appendleft(entry)
+
+    def _touch(self, node: _Node) -> None:
+        self._order.move_to_front(node)
+
+    def _remove(self, node: _Node) -> None:
+        self._order.remove(node)
+
+    def _victim(self) -> _Node:
+        return self._order.last_node()
+
+
+class _Bucket:
+    """The entries of an LFUCache that have been used the same number of
+    times.
+
+    === Attributes ===
+    count:
+        The number of times each entry in this bucket has been used.
+    entries:
+        The entries, most recently used first.
+    """
+    __slots__ = ('count', 'entries')
+    count: int
+    entries: DoublyLinkedList
+
+    def __init__(self, count: int) -> None:
+        """Initialize a new empty bucket for entries used <count> times.
+        """
+        self.count = count
+        self.entries = DoublyLinkedList([])
+
+
+class LFUCache(_Cache):
+    """A cache that evicts the least frequently used entry first, and of
+    those, the least recently used one.
+
+    >>> cache = LFUCache(max_size=2)
+    >>> cache.put('a', 1)
+    >>> cache.put('b', 2)
+    >>> cache.get('a'), cache.get('a'), cache.get('b')
+    (1, 1, 2)
+    >>> cache.put('c', 3)  # 'b' was used twice, 'a' three times
+    >>> 'a' in cache, 'b' in cache, 'c' in cache
+    (True, False, True)
+
+    Weights and expiry work the same way in both caches:
+
+    >>> now = [0.0]
+    >>> cache = LFUCache(max_size=None, max_weight=10, weigher=len, ttl=5,
+    ...                  clock=lambda: now[0])
+    >>> cache.put('a', 'xxxx')
+    >>> cache.put('b', 'yyyyyy')
+    >>> cache.put('c', 'z')  # 'a' and 'b' are used once; 'a' is older
+    >>> sorted(key for key in 'abc' if key in cache), cache.weight()
+    (['b', 'c'], 7)
+    >>> now[0] = 5.0
+    >>> cache.get('b'), cache.evictions
+    (None, 2)
+    """
+    # === Private Attributes ===
+    # _buckets:
+    #     The nonempty _Buckets, in increasing order of count.
+    _buckets: DoublyLinkedList
+
+    def __init__(self, max_size: Optional[int] = 128,
+                 max_weight: Optional[float] = None,
+                 weigher: Optional[Callable[[Any], float]] = None,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize a new empty cache.
+        """
+        _Cache.__init__(self, max_size, max_weight, weigher, ttl, clock)
+        self._buckets = DoublyLinkedList([])
+
+    def _add(self, entry: _Entry) -> _Node:
+        first = self._buckets.first_node()
+        if first is None or first.item.count != 1:
+            first = self._buckets.appendleft(_Bucket(1))
+        entry.bucket = first
+        return first.item.entries.appendleft(entry)
+
+    def _touch(self, node: _Node) -> None:
+        entry = node.item
+        bucket_node = entry.bucket
+        count = bucket_node.item.count + 1
+        # Find or make the next bucket before the entry leaves this one,
+        # which may then be removed.
+        next_node = bucket_node.next
+        if next_node is None or next_node.item.count != count:
+            next_node = self._buckets.insert_after(bucket_node,
+                                                   _Bucket(count))
+        self._remove(node)
+        entry.bucket = next_node
+        self._nodes[entry.key] = next_node.item.entries.appendleft(entry)
+
+    def _remove(self, node: _Node) -> None:
+        bucket_node = node.item.bucket
+        bucket_node.item.entries.remove(node)
+        if bucket_node.item.entries.is_empty():
+            self._buckets.remove(bucket_node)
+
+    def _victim(self) -> _Node:
+        return self._buckets.first_node().item.entries.last_node()
+
+
+# Marks a key with no value in cached, since None may be a result.
+_MISSING = object()
+# Separates the positional and keyword arguments in a cached key.
+_KWARGS = object()
+
+
+def cached(cache: Optional[_Cache] = None) -> Callable:
+    """Return a decorator that keeps the results of a function in <cache>
+    (a new LRUCache() if <cache> is None), keyed by its arguments.
+
+    The arguments must be hashable. The decorated function has the cache
+    as its <cache> attribute.
+
+    >>> @cached(LFUCache(max_size=10))
+    ... def square(x):
+    ...     print('computing', x)
+    ...     return x * x
+    >>> square(3)
+    computing 3
+    9
+    >>> square(3)
+    9
+    >>> square.cache.hits, square.cache.misses
+    (1, 1)
+    """
+    if cache is None:
+        cache = LRUCache()
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = args
+            if kwargs:
+                key += (_KWARGS,) + tuple(sorted(kwargs.items()))
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
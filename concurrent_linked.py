@@ -0,0 +1,443 @@
+"""Thread-safe linked queue and stack
+
+=== Module Description ===
+This module contains ConcurrentQueue and ConcurrentStack, which can be
+shared between producer and consumer threads. Both are built from
+linked_list._Node and follow the interface of queue.Queue: put and get
+block by default, take an optional timeout, and raise queue.Full or
+queue.Empty when they give up. put_many and get_many move a batch of
+items while taking the lock only once: a batch is added all at once or
+not at all, so other threads' items never end up inside it, and it blocks
+and times out as a single put or get does.
+
+ConcurrentQueue is the two-lock queue of Michael and Scott: the head and
+the tail have separate locks, and a placeholder node keeps them apart, so
+one producer and one consumer never wait for each other. A producer only
+takes the head lock to wake a consumer that is actually waiting.
+"""
+import threading
+import time
+from queue import Empty, Full
+from typing import Any, Iterable, List, Optional
+
+from linked_list import _Node
+
+
+class ConcurrentQueue:
+    """A first-in-first-out (FIFO) queue that is safe to share between
+    threads.
+
+    If <maxsize> is positive, put blocks while the queue holds <maxsize>
+    items; otherwise the queue is unbounded.
+
+    >>> q = ConcurrentQueue()
+    >>> q.put('hello')
+    >>> q.put_many(['a', 'b'])
+    >>> q.get()
+    'hello'
+    >>> q.get_many(5)
+    ['a', 'b']
+    >>> q.get(timeout=0.01)
+    Traceback (most recent call last):
+    _queue.Empty
+    """
+    # === Private Attributes ===
+    # _head:
+    #     A placeholder node; the first item is in _head.next. Only changed
+    #     while holding _head_lock.
+    # _tail:
+    #     The last node (the placeholder, if the queue is empty). Only read
+    #     or changed while holding _tail_lock.
+    # _not_empty:
+    #     A condition on _head_lock that consumers wait on.
+    # _waiting:
+    #     The number of consumers waiting on, or about to wait on,
+    #     _not_empty.
+    # _slots:
+    #     Counts the free places, or None if the queue is unbounded.
+    # _maxsize:
+    #     The most items the queue may hold, or 0 if it is unbounded.
+    # _batch_lock:
+    #     Held by a put_many while it acquires its slots one by one.
+    _head: _Node
+    _tail: _Node
+    _head_lock: threading.Lock
+    _tail_lock: threading.Lock
+    _not_empty: threading.Condition
+    _waiting: int
+    _slots: Optional[threading.Semaphore]
+    _maxsize: int
+    _batch_lock: threading.Lock
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Initialize a new empty queue.
+        """
+        self._head = self._tail = _Node(None)
+        self._head_lock = threading.Lock()
+        self._tail_lock = threading.Lock()
+        self._not_empty = threading.Condition(self._head_lock)
+        self._waiting = 0
+        self._slots = threading.Semaphore(maxsize) if maxsize > 0 else None
+        self._maxsize = max(maxsize, 0)
+        self._batch_lock = threading.Lock()
+
+    def empty(self) -> bool:
+        """Return whether this queue is empty.
+
+        Other threads may change the queue at any time, so the answer may
+        be out of date by the time it is used.
+        """
+        return self._head.next is None
+
+    def put(self, item: Any, block: bool = True,
+            timeout: Optional[float] = None) -> None:
+        """Add <item> to the back of this queue.
+
+        If the queue is full, wait until there is room, for at most
+        <timeout> seconds if <timeout> is not None, or not at all if <block>
+        is False; then raise queue.Full.
+        """
+        if self._slots is not None and \
+                not _acquire(self._slots, block, timeout):
+            raise Full
+        new_node = _Node(item)
+        with self._tail_lock:
+            self._tail.next = new_node
+            self._tail = new_node
+        self._wake_consumers(1)
+
+    def put_nowait(self, item: Any) -> None:
+        """Equivalent to put(item, block=False).
+        """
+        self.put(item, block=False)
+
+    def put_many(self, items: Iterable, block: bool = True,
+                 timeout: Optional[float] = None) -> None:
+        """Add the items of <items> to the back of this queue, in order.
+
+        The new nodes are linked together first and then added under one
+        acquisition of the tail lock, so other threads' items never end up
+        between them. On a bounded queue, this first waits until there is
+        room for all of them, as put does for one item; if it gives up, it
+        raises queue.Full and adds none of them.
+
+        Raise ValueError if a bounded queue could never hold all the items.
+
+        >>> q = ConcurrentQueue(maxsize=3)
+        >>> q.put('x')
+        >>> q.put_many(['a', 'b', 'c'], timeout=0.01)
+        Traceback (most recent call last):
+        queue.Full
+        >>> q.put_many(['a', 'b'], block=False)
+        >>> q.get_many(5)
+        ['x', 'a', 'b']
+        """
+        first = last = None
+        n = 0
+        for item in items:
+            new_node = _Node(item)
+            if last is None:
+                first = new_node
+            else:
+                last.next = new_node
+            last = new_node
+            n += 1
+        if n == 0:
+            return
+        if self._slots is not None and not _acquire_many(
+                self._slots, self._batch_lock, self._maxsize, n, block,
+                timeout):
+            raise Full
+        with self._tail_lock:
+            self._tail.next = first
+            self._tail = last
+        self._wake_consumers(n)
+
+    def _wake_consumers(self, n: int) -> None:
+        """Wake up to <n> consumers waiting for items, after <n> items have
+        been linked in.
+
+        A consumer adds itself to _waiting *before* it checks for an item.
+        So if this reads _waiting as 0, any consumer that has not counted
+        itself yet will find the new items; no wakeup is lost.
+        """
+        if self._waiting:
+            with self._head_lock:
+                self._not_empty.notify(n)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the item at the front of this queue.
+
+        If the queue is empty, wait until it is not, for at most <timeout>
+        seconds if <timeout> is not None, or not at all if <block> is
+        False; then raise queue.Empty.
+        """
+        with self._head_lock:
+            self._wait_for_item(block, timeout)
+            item = self._pop_head()
+        if self._slots is not None:
+            self._slots.release()
+        return item
+
+    def get_nowait(self) -> Any:
+        """Equivalent to get(block=False).
+        """
+        return self.get(block=False)
+
+    def get_many(self, max_items: int, block: bool = True,
+                 timeout: Optional[float] = None) -> List[Any]:
+        """Remove and return up to <max_items> items from the front of this
+        queue, in order.
+
+        Waiting only happens for the first item, as in get; after that,
+        only the items that are already in the queue are taken.
+
+        Precondition: max_items >= 1
+        """
+        with self._head_lock:
+            self._wait_for_item(block, timeout)
+            items = [self._pop_head()]
+            while len(items) < max_items and self._head.next is not None:
+                items.append(self._pop_head())
+        if self._slots is not None:
+            self._slots.release(len(items))
+        return items
+
+    def _wait_for_item(self, block: bool, timeout: Optional[float]) -> None:
+        """Return once this queue is not empty, or raise queue.Empty after
+        waiting as get does.
+
+        Precondition: the caller holds _head_lock.
+        """
+        if self._head.next is not None:
+            return
+        if not block:
+            raise Empty
+        self._waiting += 1
+        try:
+            if not self._not_empty.wait_for(
+                    lambda: self._head.next is not None, timeout):
+                raise Empty
+        finally:
+            self._waiting -= 1
+
+    def _pop_head(self) -> Any:
+        """Unlink the first item of this queue and return it.
+
+        The item's node becomes the new placeholder.
+
+        Precondition: the caller holds _head_lock, and the queue is not
+        empty.
+        """
+        new_head = self._head.next
+        item = new_head.item
+        new_head.item = None
+        self._head = new_head
+        return item
+
+
+class ConcurrentStack:
+    """A last-in-first-out (LIFO) stack that is safe to share between
+    threads, with the same interface as ConcurrentQueue.
+
+    Both ends of a stack are the same node, so one lock guards it.
+
+    >>> s = ConcurrentStack()
+    >>> s.put_many([1, 2, 3])
+    >>> s.get()
+    3
+    >>> s.get_many(5)
+    [2, 1]
+    """
+    # === Private Attributes ===
+    # _top:
+    #     The node at the top of the stack, or None if it is empty.
+    # _not_empty:
+    #     A condition on _lock that consumers wait on.
+    # _waiting:
+    #     The number of consumers waiting on _not_empty.
+    # _slots:
+    #     Counts the free places, or None if the stack is unbounded.
+    # _maxsize:
+    #     The most items the stack may hold, or 0 if it is unbounded.
+    # _batch_lock:
+    #     Held by a put_many while it acquires its slots one by one.
+    _top: Optional[_Node]
+    _lock: threading.Lock
+    _not_empty: threading.Condition
+    _waiting: int
+    _slots: Optional[threading.Semaphore]
+    _maxsize: int
+    _batch_lock: threading.Lock
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Initialize a new empty stack.
+        """
+        self._top = None
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._waiting = 0
+        self._slots = threading.Semaphore(maxsize) if maxsize > 0 else None
+        self._maxsize = max(maxsize, 0)
+        self._batch_lock = threading.Lock()
+
+    def empty(self) -> bool:
+        """Return whether this stack is empty.
+
+        As for ConcurrentQueue.empty, the answer may be out of date.
+        """
+        return self._top is None
+
+    def put(self, item: Any, block: bool = True,
+            timeout: Optional[float] = None) -> None:
+        """Add <item> to the top of this stack.
+
+        Blocks, and raises queue.Full, as ConcurrentQueue.put does.
+        """
+        if self._slots is not None and \
+                not _acquire(self._slots, block, timeout):
+            raise Full
+        new_node = _Node(item)
+        with self._lock:
+            new_node.next = self._top
+            self._top = new_node
+            if self._waiting:
+                self._not_empty.notify()
+
+    def put_nowait(self, item: Any) -> None:
+        """Equivalent to put(item, block=False).
+        """
+        self.put(item, block=False)
+
+    def put_many(self, items: Iterable, block: bool = True,
+                 timeout: Optional[float] = None) -> None:
+        """Add the items of <items> to the top of this stack, in order, so
+        that the last one ends up on top.
+
+        The items are added together, and block, raise queue.Full or raise
+        ValueError, as for ConcurrentQueue.put_many.
+        """
+        top = bottom = None
+        n = 0
+        for item in items:
+            new_node = _Node(item)
+            new_node.next = top
+            top = new_node
+            if bottom is None:
+                bottom = new_node
+            n += 1
+        if n == 0:
+            return
+        if self._slots is not None and not _acquire_many(
+                self._slots, self._batch_lock, self._maxsize, n, block,
+                timeout):
+            raise Full
+        with self._lock:
+            bottom.next = self._top
+            self._top = top
+            if self._waiting:
+                self._not_empty.notify(n)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the item at the top of this stack.
+
+        Blocks, and raises queue.Empty, as ConcurrentQueue.get does.
+        """
+        with self._lock:
+            self._wait_for_item(block, timeout)
+            node = self._top
+            self._top = node.next
+        if self._slots is not None:
+            self._slots.release()
+        return node.item
+
+    def get_nowait(self) -> Any:
+        """Equivalent to get(block=False).
+        """
+        return self.get(block=False)
+
+    def get_many(self, max_items: int, block: bool = True,
+                 timeout: Optional[float] = None) -> List[Any]:
+        """Remove and return up to <max_items> items from the top of this
+        stack, top first.
+
+        Waits only for the first item, as ConcurrentQueue.get_many does.
+
+        Precondition: max_items >= 1
+        """
+        items = []
+        with self._lock:
+            self._wait_for_item(block, timeout)
+            while len(items) < max_items and self._top is not None:
+                items.append(self._top.item)
+                self._top = self._top.next
+        if self._slots is not None:
+            self._slots.release(len(items))
+        return items
+
+    def _wait_for_item(self, block: bool, timeout: Optional[float]) -> None:
+        """Return once this stack is not empty, or raise queue.Empty after
+        waiting as get does.
+
+        Precondition: the caller holds _lock.
+        """
+        if self._top is not None:
+            return
+        if not block:
+            raise Empty
+        self._waiting += 1
+        try:
+            if not self._not_empty.wait_for(lambda: self._top is not None,
+                                            timeout):
+                raise Empty
+        finally:
+            self._waiting -= 1
+
+
+def _acquire(semaphore: threading.Semaphore, block: bool,
+             timeout: Optional[float]) -> bool:
+    """Acquire <semaphore> as queue.Queue would: waiting for at most
+    <timeout> seconds if <timeout> is not None, or not at all if <block> is
+    False. Return whether it was acquired.
+    """
+    if not block:
+        return semaphore.acquire(blocking=False)
+    return semaphore.acquire(timeout=timeout)
+
+
+def _acquire_many(semaphore: threading.Semaphore, batch_lock: threading.Lock,
+                  maxsize: int, n: int, block: bool,
+                  timeout: Optional[float]) -> bool:
+    """Acquire <semaphore>, which counts the free places of a container of
+    <maxsize> places, <n> times, waiting as _acquire does for all of them
+    together. Return whether they were all acquired; if not, none are kept.
+
+    Only one batch at a time collects places, while holding <batch_lock>.
+    Two batches that each held some places while waiting for more could
+    otherwise wait for each other forever.
+
+    Raise ValueError if n > maxsize, since the batch could never fit.
+    """
+    if n > maxsize:
+        raise ValueError(f'a batch of {n} items can never fit in {maxsize}')
+    deadline = None if timeout is None else time.monotonic() + timeout
+    if not batch_lock.acquire(block, -1 if timeout is None else timeout):
+        return False
+    try:
+        acquired = 0
+        while acquired < n:
+            remaining = None if deadline is None else \
+                max(0.0, deadline - time.monotonic())
+            if not _acquire(semaphore, block, remaining):
+                if acquired:
+                    semaphore.release(acquired)
+                return False
+            acquired += 1
+        return True
+    finally:
+        batch_lock.release()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,21 +1,37 @@
+"""Doubly linked lists
+
+=== Module Description ===
+This module contains DoublyLinkedList; RingBuffer, a DoublyLinkedList of
+bounded length that reuses its oldest node when it is full; and
+SlidingWindow, which keeps the sum, minimum and maximum of the last n
+values of a stream.
+"""
 from __future__ import annotations
-from typing import Any, List, Optional
+from collections import deque
+from typing import Any, Deque, Iterable, Iterator, Optional
 
 
 class _Node:
-    """A node in a linked list.
+    """A node in a doubly linked list.
 
     Note that this is considered a "private class", one which is only meant
-    to be used in this module by the LinkedList class, but not by client code.
+    to be used in this module by the DoublyLinkedList class, but not by
+    client code. Client code may hold on to the nodes that append and
+    appendleft return, as handles to pass back to remove and move_to_front.
 
     === Attributes ===
     item:
         The data stored in this node.
     next:
         The next node in the list, or None if there are no more nodes.
+    prev:
+        The previous node in the list, or None if this is the first node.
     """
+    # Nodes have no __dict__, which saves about 100 bytes per node.
+    __slots__ = ('item', 'next', 'prev')
     item: Any
     next: Optional[_Node]
+    prev: Optional[_Node]
 
     def __init__(self, item: Any) -> None:
         """Initialize a new node storing <item>, with no next node.
@@ -26,31 +42,48 @@ class _Node:
 
 
 class DoublyLinkedList:
-    """A linked list implementation of the List ADT.
+    """A doubly linked list implementation of the List ADT.
+
+    Every node links to both of its neighbours, so items can be added and
+    removed at either end, or anywhere a node handle points to, in
+    constant time.
+
+    >>> lst = DoublyLinkedList([2, 3])
+    >>> node = lst.appendleft(1)
+    >>> lst.append(4).item
+    4
+    >>> str(lst), len(lst)
+    ('[1 <-> 2 <-> 3 <-> 4]', 4)
+    >>> lst.move_to_front(lst.append(5))
+    >>> lst.remove(node)
+    1
+    >>> list(lst), list(reversed(lst))
+    ([5, 2, 3, 4], [4, 3, 2, 5])
     """
     # === Private Attributes ===
     # _first:
     #     The first node in the linked list, or None if the list is empty.
+    # _last:
+    #     The last node in the linked list, or None if the list is empty.
+    # _size:
+    #     The number of nodes in the linked list.
     _first: Optional[_Node]
+    _last: Optional[_Node]
+    _size: int
+
+    # === Representation Invariants ===
+    # For every node n in the list, n.next.prev is n (if n.next is not
+    # None) and n.prev.next is n (if n.prev is not None).
+    # _first.prev and _last.next are None.
 
-    def __init__(self, items: list) -> None:
-        """Initialize a new empty linked list containing the given items.
+    def __init__(self, items: Iterable) -> None:
+        """Initialize a new linked list containing the given items.
         """
         self._first = None
         self._last = None
-        self.items = items
-        if items:
-            self._first = _Node(items[0])
-            self._last = _Node(items[len(items) - 1])
-            curr_1 = self._first
-            curr_2 = self._last
-            i = 1
-            while i < len(items):
-                curr_1.next = _Node(items[i])
-                curr_2.prev = _Node(items[len(items) - i - 1])
-                curr_1 = curr_1.next
-                curr_2 = curr_2.prev
-                i += 1
+        self._size = 0
+        for item in items:
+            self.append(item)
 
     # ------------------------------------------------------------------------
     # Methods from lecture/readings
@@ -58,9 +91,378 @@ class DoublyLinkedList:
     def is_empty(self) -> bool:
         """Return whether this linked list is empty.
 
-        # >>> LinkedList([]).is_empty()
-        # True
-        # >>> LinkedList([1, 2, 3]).is_empty()
-        # False
+        >>> DoublyLinkedList([]).is_empty()
+        True
+        >>> DoublyLinkedList([1, 2, 3]).is_empty()
+        False
         """
         return self._first is None
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list, in constant time.
+        """
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, first to last.
+        """
+        curr = self._first
+        while curr is not None:
+            yield curr.item
+            curr = curr.next
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, last to first.
+        """
+        curr = self._last
+        while curr is not None:
+            yield curr.item
+            curr = curr.prev
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 <-> item2 <-> ... <-> item-n]'.
+        """
+        return '[' + ' <-> '.join(str(item) for item in self) + ']'
+
+    # ------------------------------------------------------------------------
+    # Deque operations
+    # ------------------------------------------------------------------------
+    def append(self, item: Any) -> _Node:
+        """Add <item> to the end of this list, and return its node.
+        """
+        new_node = _Node(item)
+        self._link_last(new_node)
+        return new_node
+
+    def appendleft(self, item: Any) -> _Node:
+        """Add <item> to the front of this list, and return its node.
+        """
+        new_node = _Node(item)
+        self._link_first(new_node)
+        return new_node
+
+    def insert_after(self, node: _Node, item: Any) -> _Node:
+        """Add <item> right after <node>, and return its node.
+
+        Precondition: <node> is in this list.
+
+        >>> lst = DoublyLinkedList([1, 3])
+        >>> lst.insert_after(lst.first_node(), 2).item
+        2
+        >>> list(lst), lst.last_node().item
+        ([1, 2, 3], 3)
+        """
+        new_node = _Node(item)
+        self._link_after(node, new_node)
+        return new_node
+
+    def first_node(self) -> Optional[_Node]:
+        """Return the first node of this list, or None if it is empty.
+        """
+        return self._first
+
+    def last_node(self) -> Optional[_Node]:
+        """Return the last node of this list, or None if it is empty.
+        """
+        return self._last
+
+    def pop(self) -> Any:
+        """Remove and return the last item of this list.
+
+        Raise IndexError if this list is empty.
+        """
+        if self._last is None:
+            raise IndexError
+        return self.remove(self._last)
+
+    def popleft(self) -> Any:
+        """Remove and return the first item of this list.
+
+        Raise IndexError if this list is empty.
+        """
+        if self._first is None:
+            raise IndexError
+        return self.remove(self._first)
+
+    def remove(self, node: _Node) -> Any:
+        """Unlink <node> from this list, and return its item.
+
+        Precondition: <node> is in this list.
+        """
+        self._unlink(node)
+        return node.item
+
+    def move_to_front(self, node: _Node) -> None:
+        """Move <node> to the front of this list.
+
+        Precondition: <node> is in this list.
+        """
+        if node is not self._first:
+            self._unlink(node)
+            self._link_first(node)
+
+    def _link_first(self, node: _Node) -> None:
+        """Link <node>, which is in no list, in at the front of this list.
+        """
+        node.prev = None
+        node.next = self._first
+        if self._first is None:
+            self._last = node
+        else:
+            self._first.prev = node
+        self._first = node
+        self._size += 1
+
+    def _link_last(self, node: _Node) -> None:
+        """Link <node>, which is in no list, in at the end of this list.
+        """
+        node.next = None
+        node.prev = self._last
+        if self._last is None:
+            self._first = node
+        else:
+            self._last.next = node
+        self._last = node
+        self._size += 1
+
+    def _link_after(self, node: _Node, new_node: _Node) -> None:
+        """Link <new_node>, which is in no list, in right after <node>.
+
+        Precondition: <node> is in this list.
+        """
+        if node is self._last:
+            self._link_last(new_node)
+            return
+        new_node.prev = node
+        new_node.next = node.next
+        node.next.prev = new_node
+        node.next = new_node
+        self._size += 1
+
+    def _unlink(self, node: _Node) -> None:
+        """Unlink <node> from this list. Its own links are cleared, so it
+        keeps no other node alive.
+
+        Precondition: <node> is in this list.
+        """
+        if node.prev is None:
+            self._first = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self._last = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+        self._size -= 1
+
+
+class RingBuffer(DoublyLinkedList):
+    """A doubly linked list of at most <capacity> items.
+
+    Adding an item to a full ring buffer drops the item at the other end,
+    and reuses its node for the new item, so once the buffer is full no
+    more nodes are allocated. A node handle therefore only stays valid
+    until its item is dropped.
+
+    >>> ring = RingBuffer([1, 2, 3], 3)
+    >>> node = ring.first_node()
+    >>> ring.append(4) is node
+    True
+    >>> str(ring)
+    '[2 <-> 3 <-> 4]'
+    >>> ring.appendleft(1) is node
+    True
+    >>> str(ring), ring.is_full()
+    ('[1 <-> 2 <-> 3]', True)
+    """
+    # === Private Attributes ===
+    # _capacity:
+    #     The greatest number of items this list may hold.
+    _capacity: int
+
+    # === Representation Invariants ===
+    # _size <= _capacity
+
+    def __init__(self, items: Iterable, capacity: int) -> None:
+        """Initialize a new ring buffer containing the last <capacity> of
+        the given items.
+
+        Precondition: capacity >= 1
+        """
+        self._capacity = capacity
+        DoublyLinkedList.__init__(self, items)
+
+    @property
+    def capacity(self) -> int:
+        """The greatest number of items this list may hold.
+        """
+        return self._capacity
+
+    def is_full(self) -> bool:
+        """Return whether this list holds <capacity> items.
+        """
+        return self._size == self._capacity
+
+    def append(self, item: Any) -> _Node:
+        """Add <item> to the end of this list, and return its node.
+
+        If this list is full, its first item is dropped first.
+        """
+        if self._size < self._capacity:
+            return DoublyLinkedList.append(self, item)
+        node = self._first
+        self._unlink(node)
+        node.item = item
+        self._link_last(node)
+        return node
+
+    def appendleft(self, item: Any) -> _Node:
+        """Add <item> to the front of this list, and return its node.
+
+        If this list is full, its last item is dropped first.
+        """
+        if self._size < self._capacity:
+            return DoublyLinkedList.appendleft(self, item)
+        node = self._last
+        self._unlink(node)
+        node.item = item
+        self._link_first(node)
+        return node
+
+    def insert_after(self, node: _Node, item: Any) -> _Node:
+        """Add <item> right after <node>, and return its node.
+
+        If this list is full, its first item is dropped, as for append. If
+        that item is the one in <node>, <item> takes its place.
+
+        Precondition: <node> is in this list.
+
+        >>> ring = RingBuffer([1, 2, 4], 3)
+        >>> ring.insert_after(ring.last_node().prev, 3).item
+        3
+        >>> str(ring)
+        '[2 <-> 3 <-> 4]'
+        >>> first = ring.first_node()
+        >>> ring.insert_after(first, 5) is first
+        True
+        >>> str(ring)
+        '[5 <-> 3 <-> 4]'
+        """
+        if self._size < self._capacity:
+            return DoublyLinkedList.insert_after(self, node, item)
+        oldest = self._first
+        if oldest is not node:
+            self._unlink(oldest)
+            self._link_after(node, oldest)
+        oldest.item = item
+        return oldest
+
+
+class SlidingWindow:
+    """The last <size> values of a stream of numbers, with their sum,
+    minimum and maximum.
+
+    Each push takes amortized O(1) time. The values are kept in a
+    RingBuffer. The minimum and maximum come from monotonic deques of its
+    nodes: the maximum deque holds, oldest first, each node whose value is
+    greater than every value after it, so its front is the maximum; no
+    node in it is ever overtaken again, so each one is pushed and popped
+    at most once.
+
+    The sum is updated by adding each new value and subtracting each
+    dropped one, so with floats it may drift by rounding error.
+
+    >>> window = SlidingWindow(3)
+    >>> for value in [5, 1, 4, 2, 8]:
+    ...     window.push(value)
+    >>> list(window), window.sum(), window.min(), window.max()
+    ([4, 2, 8], 14, 2, 8)
+    """
+    # === Private Attributes ===
+    # _ring:
+    #     The values in the window, oldest first.
+    # _sum:
+    #     The sum of the values in the window.
+    # _max_nodes:
+    #     The nodes of _ring whose value is greater than that of every
+    #     later node, oldest first.
+    # _min_nodes:
+    #     The nodes of _ring whose value is less than that of every later
+    #     node, oldest first.
+    _ring: RingBuffer
+    _sum: Any
+    _max_nodes: Deque[_Node]
+    _min_nodes: Deque[_Node]
+
+    def __init__(self, size: int) -> None:
+        """Initialize a new empty window of the last <size> values.
+
+        Precondition: size >= 1
+        """
+        self._ring = RingBuffer([], size)
+        self._sum = 0
+        self._max_nodes = deque()
+        self._min_nodes = deque()
+
+    def __len__(self) -> int:
+        """Return the number of values in this window.
+        """
+        return len(self._ring)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the values in this window, oldest first.
+        """
+        return iter(self._ring)
+
+    def push(self, value: Any) -> None:
+        """Add <value> to this window, dropping the oldest value if the
+        window is full.
+        """
+        ring = self._ring
+        if ring.is_full():
+            oldest = ring.first_node()
+            self._sum -= oldest.item
+            if self._max_nodes[0] is oldest:
+                self._max_nodes.popleft()
+            if self._min_nodes[0] is oldest:
+                self._min_nodes.popleft()
+        node = ring.append(value)
+        self._sum += value
+        max_nodes = self._max_nodes
+        while max_nodes and max_nodes[-1].item <= value:
+            max_nodes.pop()
+        max_nodes.append(node)
+        min_nodes = self._min_nodes
+        while min_nodes and min_nodes[-1].item >= value:
+            min_nodes.pop()
+        min_nodes.append(node)
+
+    def sum(self) -> Any:
+        """Return the sum of the values in this window (0 if it is empty).
+        """
+        return self._sum
+
+    def min(self) -> Any:
+        """Return the smallest value in this window.
+
+        Raise ValueError if this window is empty.
+        """
+        if not self._min_nodes:
+            raise ValueError
+        return self._min_nodes[0].item
+
+    def max(self) -> Any:
+        """Return the largest value in this window.
+
+        Raise ValueError if this window is empty.
+        """
+        if not self._max_nodes:
+            raise ValueError
+        return self._max_nodes[0].item
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,177 @@
+"""External sorting
+
+=== Module Description ===
+This module sorts data that does not fit in memory. Records are read in
+chunks that fit in a memory budget, each chunk is sorted with timsort2 and
+spilled to a temporary file as a sorted run, and the runs are then merged
+in a single streaming pass (or several, if there are too many runs to hold
+one read buffer for each at once).
+
+Runs are stored as a sequence of pickled batches of records, so reading a
+run back only ever holds one batch of it in memory.
+"""
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from timsort import merge_sorted, timsort2
+
+# The default memory budget, in bytes.
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# The largest approximate size, in bytes, of one batch of records in a run
+# file. Each run being merged keeps one batch in memory as its read buffer,
+# so with a small memory budget the batches are made smaller than this.
+BATCH_BYTES = 64 * 1024
+
+
+def external_sort(records: Iterable[Any],
+                  memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                  key: Optional[Callable[[Any], Any]] = None,
+                  tmp_dir: Optional[str] = None) -> Iterator[Any]:
+    """Return an iterator over the items of <records> in sorted order.
+
+    At most about <memory_limit> bytes of records are held in memory at any
+    time; the rest is spilled to temporary files in <tmp_dir> (by default,
+    the system's temporary directory). The files are removed when the
+    iterator is exhausted or closed. Record sizes are estimated with
+    sys.getsizeof, so the limit is approximate for nested records.
+
+    <key> has the same meaning as for list.sort. The sort is stable.
+    Records must be picklable.
+
+    >>> list(external_sort(iter([5, 3, 8, 1, 9, 2]), memory_limit=100))
+    [1, 2, 3, 5, 8, 9]
+    >>> list(external_sort(['bb', 'a', 'ccc'], key=len))
+    ['a', 'bb', 'ccc']
+
+    Records with equal keys keep their order, even across runs, and even
+    if the keys only define <:
+
+    >>> class Key:
+    ...     def __init__(self, k):
+    ...         self.k = k
+    ...     def __lt__(self, other):
+    ...         return self.k < other.k
+    >>> records = [(i % 3, i) for i in range(30)]  # about 6 runs
+    >>> result = external_sort(records, memory_limit=300,
+    ...                        key=lambda record: Key(record[0]))
+    >>> list(result) == sorted(records, key=lambda record: record[0])
+    True
+    """
+    # Each merge holds one read batch per run and one write batch, so fan_in
+    # runs at a time keep within memory_limit.
+    fan_in = max(2, memory_limit // BATCH_BYTES)
+    batch_bytes = max(1, memory_limit // (fan_in + 1))
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+        runs = []
+        chunk = []
+        size = 0
+        for record in records:
+            chunk.append(record)
+            size += _record_size(record)
+            if size >= memory_limit:
+                timsort2(chunk, key=key)
+                runs.append(_write_run(directory, len(runs), chunk,
+                                       batch_bytes))
+                chunk = []
+                size = 0
+
+        timsort2(chunk, key=key)
+        if not runs:
+            # Everything fit in memory.
+            yield from chunk
+            return
+        if chunk:
+            runs.append(_write_run(directory, len(runs), chunk,
+                                   batch_bytes))
+        del chunk
+
+        # Merge groups of runs until there are few enough to give each one
+        # its own read buffer.
+        next_run = len(runs)
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                merged.append(_write_run(directory, next_run,
+                                         _merge_runs(group, key),
+                                         batch_bytes))
+                next_run += 1
+                for path in group:
+                    os.remove(path)
+            runs = merged
+
+        yield from _merge_runs(runs, key)
+
+
+def sort_file(in_path: str, out_path: str,
+              memory_limit: int = DEFAULT_MEMORY_LIMIT,
+              key: Optional[Callable[[str], Any]] = None) -> None:
+    """Sort the lines of the text file <in_path> and write them to the text
+    file <out_path>, holding at most about <memory_limit> bytes of lines in
+    memory.
+
+    <key> is applied to each line without its trailing newline.
+    """
+    with open(in_path) as in_file, open(out_path, 'w') as out_file:
+        lines = (line.rstrip('\n') for line in in_file)
+        for line in external_sort(lines, memory_limit, key):
+            out_file.write(line)
+            out_file.write('\n')
+
+
+def _record_size(record: Any) -> int:
+    """Return the approximate number of bytes <record> takes up in a list.
+    """
+    # Every list slot is also a pointer.
+    return sys.getsizeof(record) + 8
+
+
+def _write_run(directory: str, n: int, records: Iterable[Any],
+               batch_bytes: int = BATCH_BYTES) -> str:
+    """Write the sorted <records> to a new run file in <directory>, in
+    batches of about <batch_bytes> bytes, and return its path.
+
+    <n> is a number used to name the file, unique among the runs in
+    <directory>.
+    """
+    path = os.path.join(directory, f'run{n}')
+    with open(path, 'wb') as run_file:
+        batch = []
+        size = 0
+        for record in records:
+            batch.append(record)
+            size += _record_size(record)
+            if size >= batch_bytes:
+                pickle.dump(batch, run_file, pickle.HIGHEST_PROTOCOL)
+                batch = []
+                size = 0
+        if batch:
+            pickle.dump(batch, run_file, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: str) -> Iterator[Any]:
+    """Return an iterator over the records in the run file <path>, reading
+    one batch at a time.
+    """
+    with open(path, 'rb') as run_file:
+        while True:
+            try:
+                batch = pickle.load(run_file)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _merge_runs(paths: List[str],
+                key: Optional[Callable[[Any], Any]]) -> Iterator[Any]:
+    """Return an iterator over the records of the run files <paths> in
+    sorted order.
+
+    Runs are merged with merge_sorted. On ties, records from earlier runs
+    come first, which keeps the sort stable.
+    """
+    return merge_sorted([_read_run(path) for path in paths], key)
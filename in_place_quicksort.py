@@ -4,21 +4,71 @@
 Department of Mathematical and Computational Sciences,
 University of Toronto Mississauga
 """
-from typing import Any, List, Tuple
+from typing import Any, Callable, List, Optional, Tuple
+
+from timsort import NUMPY_LEAF_SIZE, _is_numeric_array, _sort_numeric, \
+    _sort_with_key, insertion_sort
 
 
 ################################################################################
 # In-place quicksort
 ################################################################################
-def in_place_quicksort(lst: List[int]) -> None:
+def in_place_quicksort(lst: List[int],
+                       key: Optional[Callable[[Any], Any]] = None,
+                       reverse: bool = False,
+                       introsort: bool = True,
+                       three_way: Optional[bool] = None) -> None:
     """Mutate <lst> so that it is sorted.
 
+    <key> and <reverse> have the same meaning as for list.sort, and <key>
+    is called exactly once per item.
+
+    If <introsort> is True (the default), the list is sorted with introsort
+    (see _introsort), which is O(n log n) in the worst case, including on
+    sorted and reverse-sorted input. Otherwise the plain recursive quicksort
+    with pivot lst[start] is used.
+
+    If <three_way> is True, introsort partitions three ways (see
+    _three_way_partition), which is much faster when there are many equal
+    items. If it is None (the default), a sample of <lst> is checked for
+    duplicates to decide.
+
+    Unlike timsort and mergesort2, quicksort is *not* stable: items with
+    equal keys may end up in any order.
+
     >>> lst = [10, 2, 5, -6, 17, 10]
     >>> in_place_quicksort(lst)
     >>> lst
     [-6, 2, 5, 10, 10, 17]
+    >>> in_place_quicksort(lst, key=abs, reverse=True)
+    >>> lst
+    [17, 10, 10, -6, 5, 2]
+    >>> lst = list(range(10000, 0, -1))
+    >>> in_place_quicksort(lst)
+    >>> lst == list(range(1, 10001))
+    True
+    >>> lst = [i % 3 for i in range(10000)]
+    >>> in_place_quicksort(lst)
+    >>> lst == sorted(lst)
+    True
     """
-    _in_place_quicksort(lst, 0, len(lst))
+    if key is not None or reverse:
+        _sort_with_key(lambda items: in_place_quicksort(items,
+                                                        introsort=introsort,
+                                                        three_way=three_way),
+                       lst, key, reverse)
+    elif _sort_numeric(lambda arr: in_place_quicksort(arr,
+                                                      introsort=introsort,
+                                                      three_way=three_way),
+                       lst):
+        pass
+    elif introsort:
+        if three_way is None:
+            three_way = _has_many_duplicates(lst)
+        _introsort(lst, 0, len(lst), 2 * (len(lst).bit_length() - 1),
+                   three_way)
+    else:
+        _in_place_quicksort(lst, 0, len(lst))
 
 
 def _in_place_quicksort(lst: List[int], start: int, end: int) -> None:
@@ -105,6 +155,9 @@ def _in_place_partition(lst: List[int], start: int, end: int) -> int:
     >>> set(lst[5:]) == {20, 30}
     True
     """
+    if _is_numeric_array(lst):
+        return _numpy_partition(lst, start, end)
+
     pivot = lst[start]
     small_i = start + 1
     big_i = end
@@ -122,6 +175,241 @@ def _in_place_partition(lst: List[int], start: int, end: int) -> int:
     return small_i - 1
 
 
+def _three_way_partition(lst: List[int], start: int,
+                         end: int) -> Tuple[int, int]:
+    """Mutate <lst[start:end]> so that it is partitioned three ways with
+    pivot lst[start].
+
+    Let pivot = lst[start].
+    The elements of <lst> are moved around so that the final list looks like
+
+        [x1, x2, ... x_m, pivot, ..., pivot, y1, y2, ... y_n],
+
+    where each of the x's is less than the pivot, and each of the y's is
+    greater than the pivot. Every item equal to the pivot ends up in the
+    middle block, which is already sorted.
+
+    Return (lt, gt), where lst[lt:gt] is the block of items equal to the
+    pivot.
+
+    Precondition: lst[start:end] != [].
+
+    >>> lst = [5, 8, 5, 1, 5, 9, 2]
+    >>> _three_way_partition(lst, 0, 7)  # Pivot is 5
+    (2, 5)
+    >>> lst[2:5]
+    [5, 5, 5]
+    >>> set(lst[:2]) == {1, 2}
+    True
+    >>> set(lst[5:]) == {8, 9}
+    True
+    """
+    if _is_numeric_array(lst):
+        return _numpy_three_way_partition(lst, start, end)
+
+    pivot = lst[start]
+    lt = start
+    i = start + 1
+    gt = end
+
+    while i < gt:
+        if lst[i] < pivot:
+            lst[lt], lst[i] = lst[i], lst[lt]
+            lt += 1
+            i += 1
+        elif pivot < lst[i]:
+            gt -= 1
+            lst[i], lst[gt] = lst[gt], lst[i]
+        else:
+            i += 1
+
+    return lt, gt
+
+
+################################################################################
+# Introsort
+################################################################################
+# Slices this short are sorted with insertion_sort instead of partitioned.
+QUICKSORT_CUTOFF = 16
+# Slices at least this long pick their pivot with Tukey's ninther instead of
+# a plain median of three.
+NINTHER_CUTOFF = 40
+# How many items _has_many_duplicates looks at, and what fraction of them
+# must repeat an earlier one for three-way partitioning to be used.
+DUPLICATE_SAMPLE = 64
+DUPLICATE_RATIO = 0.5
+
+
+def _introsort(lst: List[int], start: int, end: int, depth_limit: int,
+               three_way: bool = False) -> None:
+    """Mutate <lst> so that the range lst[start:end] is sorted.
+
+    This is quicksort with three changes that bound its worst case:
+      - the pivot is a median of three (or a ninther, for long slices),
+        so sorted and reverse-sorted input split evenly;
+      - short slices are finished with insertion_sort (on the NumPy fast
+        path, "short" means up to NUMPY_LEAF_SIZE items);
+      - once <depth_limit> partitions have been made along one path, the
+        rest of the slice is heapsorted, so the running time is O(n log n)
+        however badly the pivots turn out.
+
+    Only the smaller side of each partition is sorted recursively; the loop
+    carries on with the larger side, so the recursion depth is O(log n).
+
+    If <three_way> is True, _three_way_partition is used, and the block of
+    items equal to the pivot is left out of both sides.
+    """
+    cutoff = NUMPY_LEAF_SIZE if _is_numeric_array(lst) else QUICKSORT_CUTOFF
+    while end - start > cutoff:
+        if depth_limit == 0:
+            _heapsort(lst, start, end)
+            return
+        depth_limit -= 1
+
+        pivot = _choose_pivot(lst, start, end)
+        lst[start], lst[pivot] = lst[pivot], lst[start]
+        if three_way:
+            lt, gt = _three_way_partition(lst, start, end)
+        else:
+            lt = _in_place_partition(lst, start, end)
+            gt = lt + 1
+
+        if lt - start < end - gt:
+            _introsort(lst, start, lt, depth_limit, three_way)
+            start = gt
+        else:
+            _introsort(lst, gt, end, depth_limit, three_way)
+            end = lt
+    insertion_sort(lst, start, end)
+
+
+def _has_many_duplicates(lst: List[int]) -> bool:
+    """Return whether a sample of about DUPLICATE_SAMPLE evenly spaced items
+    of <lst> has at least DUPLICATE_RATIO repeated items.
+
+    >>> _has_many_duplicates([i % 4 for i in range(1000)])
+    True
+    >>> _has_many_duplicates(list(range(1000)))
+    False
+    """
+    # list() makes sure the sample is a copy, even when lst is a NumPy array.
+    sample = list(lst[::max(1, len(lst) // DUPLICATE_SAMPLE)])
+    insertion_sort(sample, 0, len(sample))
+    repeats = 0
+    for i in range(1, len(sample)):
+        if not sample[i - 1] < sample[i]:
+            repeats += 1
+    return len(sample) > 1 and repeats >= DUPLICATE_RATIO * len(sample)
+
+
+def _choose_pivot(lst: List[int], start: int, end: int) -> int:
+    """Return the index of a good pivot for lst[start:end].
+
+    Precondition: end - start >= 3.
+
+    >>> _choose_pivot([5, 1, 9, 3, 7], 0, 5)  # median of 5, 9 and 7
+    4
+    """
+    mid = (start + end) // 2
+    last = end - 1
+    if end - start < NINTHER_CUTOFF:
+        return _median_of_three(lst, start, mid, last)
+    step = (end - start) // 8
+    return _median_of_three(
+        lst,
+        _median_of_three(lst, start, start + step, start + 2 * step),
+        _median_of_three(lst, mid - step, mid, mid + step),
+        _median_of_three(lst, last - 2 * step, last - step, last))
+
+
+def _median_of_three(lst: List[int], a: int, b: int, c: int) -> int:
+    """Return whichever of the indexes <a>, <b> and <c> holds the median of
+    lst[a], lst[b] and lst[c].
+
+    >>> _median_of_three([3, 1, 2], 0, 1, 2)
+    2
+    """
+    if lst[a] < lst[b]:
+        if lst[b] < lst[c]:
+            return b
+        return c if lst[a] < lst[c] else a
+    if lst[a] < lst[c]:
+        return a
+    return c if lst[b] < lst[c] else b
+
+
+def _heapsort(lst: List[int], start: int, end: int) -> None:
+    """Mutate <lst> so that the range lst[start:end] is sorted, using
+    heapsort.
+
+    >>> lst = [0, 5, 2, 8, 1, 9, 0]
+    >>> _heapsort(lst, 1, 6)
+    >>> lst
+    [0, 1, 2, 5, 8, 9, 0]
+    """
+    if _is_numeric_array(lst):
+        lst[start:end].sort(kind='heapsort')
+        return
+
+    n = end - start
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(lst, start, root, n)
+    for size in range(n - 1, 0, -1):
+        lst[start], lst[start + size] = lst[start + size], lst[start]
+        _sift_down(lst, start, 0, size)
+
+
+def _sift_down(lst: List[int], start: int, root: int, size: int) -> None:
+    """Restore the max-heap property of the heap of <size> items stored in
+    lst[start:start + size], where only the item at position <root> (counted
+    from <start>) may be smaller than its children.
+    """
+    item = lst[start + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size and lst[start + child] < lst[start + child + 1]:
+            child += 1
+        if not item < lst[start + child]:
+            break
+        lst[start + root] = lst[start + child]
+        root = child
+        child = 2 * root + 1
+    lst[start + root] = item
+
+
+################################################################################
+# NumPy fast path
+################################################################################
+def _numpy_partition(arr: Any, start: int, end: int) -> int:
+    """The vectorized version of _in_place_partition, for a NumPy array.
+    """
+    pivot = arr[start]
+    rest = arr[start + 1:end]
+    small = rest[rest <= pivot]
+    big = rest[rest > pivot]
+    pivot_index = start + len(small)
+    arr[start:pivot_index] = small
+    arr[pivot_index] = pivot
+    arr[pivot_index + 1:end] = big
+    return pivot_index
+
+
+def _numpy_three_way_partition(arr: Any, start: int,
+                               end: int) -> Tuple[int, int]:
+    """The vectorized version of _three_way_partition, for a NumPy array.
+    """
+    pivot = arr[start]
+    part = arr[start:end]
+    less = part[part < pivot]
+    greater = part[part > pivot]
+    lt = start + len(less)
+    gt = end - len(greater)
+    arr[start:lt] = less
+    arr[lt:gt] = pivot
+    arr[gt:end] = greater
+    return lt, gt
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
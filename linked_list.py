@@ -6,12 +6,18 @@ University of Toronto Mississauga
 
 === Module Description ===
 This module contains the code for a linked list implementation with two classes,
-LinkedList and _Node.
+LinkedList and _Node, and three variants of LinkedList with the same
+public interface: CursorLinkedList, which is array-backed and has no node
+objects; SkipLinkedList, an indexable skip list with O(log n) positional
+access; and UnrolledLinkedList, which stores a chunk of items in each node.
 
 All of the code from lecture is here, as well as some exercises to work on.
 """
 from __future__ import annotations
-from typing import Any, List, Optional
+import random
+from array import array
+from typing import Any, Callable, Iterable, Iterator, List, Optional, \
+    Tuple
 
 
 class _Node:
@@ -26,6 +32,8 @@ class _Node:
     next:
         The next node in the list, or None if there are no more nodes.
     """
+    # Nodes have no __dict__, which saves about 100 bytes per node.
+    __slots__ = ('item', 'next')
     item: Any
     next: Optional[_Node]
 
@@ -36,27 +44,93 @@ class _Node:
         self.next = None  # Initially pointing to nothing
 
 
+# The "next slot" of the last item in a CursorLinkedList.
+NO_SLOT = -1
+# The most levels a SkipLinkedList node can have; enough for 2 ** 32 items.
+SKIP_MAX_LEVEL = 32
+# The default number of items per node of an UnrolledLinkedList.
+UNROLLED_CAPACITY = 64
+
+
 class LinkedList:
     """A linked list implementation of the List ADT.
     """
     # === Private Attributes ===
     # _first:
     #     The first node in the linked list, or None if the list is empty.
+    # _last:
+    #     The last node in the linked list, or None if the list is empty.
+    # _size:
+    #     The number of nodes in the linked list.
     _first: Optional[_Node]
+    _last: Optional[_Node]
+    _size: int
 
-    def __init__(self, items: list) -> None:
+    def __init__(self, items: Iterable) -> None:
         """Initialize a new empty linked list containing the given items.
+
+        <items> may be any iterable; it is consumed one item at a time.
         """
         self._first = None
-        self.items = items
-        if items:
-            self._first = _Node(items[0])
-            curr = self._first
-            i = 1
-            while i < len(items):
-                curr.next = _Node(items[i])
-                curr = curr.next
-                i += 1
+        self._last = None
+        self._size = 0
+        self.extend(items)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable) -> LinkedList:
+        """Return a new linked list containing the items of <items>, in
+        order, without first collecting them into a Python list.
+
+        >>> str(LinkedList.from_iterable(i * i for i in range(4)))
+        '[0 -> 1 -> 4 -> 9]'
+        """
+        return cls(items)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, which walks the
+        nodes one at a time.
+
+        >>> list(LinkedList([1, 2, 3]))
+        [1, 2, 3]
+        """
+        curr = self._first
+        while curr is not None:
+            yield curr.item
+            curr = curr.next
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, last first.
+
+        The nodes only link forwards, so this copies the items first.
+
+        >>> list(reversed(LinkedList([1, 2, 3])))
+        [3, 2, 1]
+        """
+        return reversed(list(self))
+
+    def extend(self, items: Iterable) -> None:
+        """Append the items of <items> to the end of this list, linking each
+        new node straight onto the tail.
+
+        >>> lst = LinkedList([1])
+        >>> lst.extend(range(2, 4))
+        >>> str(lst), len(lst)
+        ('[1 -> 2 -> 3]', 3)
+        """
+        if items is self:
+            items = list(items)
+        last = self._last
+        size = self._size
+        for item in items:
+            new_node = _Node(item)
+            if last is None:
+                self._first = new_node
+            else:
+                last.next = new_node
+            last = new_node
+            size += 1
+        self._last = last
+        self._size = size
 
     # ------------------------------------------------------------------------
     # Methods from lecture/readings
@@ -80,12 +154,7 @@ class LinkedList:
         # >>> str(LinkedList([]))
         # '[]'
         """
-        items = []
-        curr = self._first
-        while curr is not None:
-            items.append(str(curr.item))
-            curr = curr.next
-        return '[' + ' -> '.join(items) + ']'
+        return '[' + ' -> '.join(str(item) for item in self) + ']'
 
     def __getitem__(self, index: int) -> Any:
         """Return the item at position <index> in this list.
@@ -123,24 +192,58 @@ class LinkedList:
         # Traceback (most recent call last):
         # IndexError
         """
-        # Create new node containing the item
-        new_node = _Node(item)
-
+        if index < 0 or index > self._size:
+            raise IndexError
         if index == 0:
-            self._first, new_node.next = new_node, self._first
+            self.appendleft(item)
+        elif index == self._size:
+            self.append(item)
         else:
+            # Create new node containing the item
+            new_node = _Node(item)
+
             # Iterate to (index-1)-th node.
             curr = self._first
             curr_index = 0
-            while curr is not None and curr_index < index - 1:
+            while curr_index < index - 1:
                 curr = curr.next
                 curr_index += 1
 
-            if curr is None:
-                raise IndexError
-            else:
-                # Update links to insert new node
-                curr.next, new_node.next = new_node, curr.next
+            # Update links to insert new node
+            curr.next, new_node.next = new_node, curr.next
+            self._size += 1
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list, in constant time.
+
+        >>> lst = LinkedList([1, 2])
+        >>> lst.append(3)
+        >>> str(lst), len(lst)
+        ('[1 -> 2 -> 3]', 3)
+        """
+        new_node = _Node(item)
+        if self._last is None:
+            self._first = new_node
+        else:
+            self._last.next = new_node
+        self._last = new_node
+        self._size += 1
+
+    def appendleft(self, item: Any) -> None:
+        """Add <item> to the front of this list, in constant time.
+
+        >>> lst = LinkedList([])
+        >>> lst.appendleft(2)
+        >>> lst.appendleft(1)
+        >>> str(lst), len(lst)
+        ('[1 -> 2]', 2)
+        """
+        new_node = _Node(item)
+        new_node.next = self._first
+        self._first = new_node
+        if self._last is None:
+            self._last = new_node
+        self._size += 1
 
     # ------------------------------------------------------------------------
     # Lab Task 1
@@ -156,12 +259,7 @@ class LinkedList:
         # >>> len(lst)
         # 3
         """
-        cnt = 0
-        curr = self._first
-        while curr is not None:
-            curr = curr.next
-            cnt += 1
-        return cnt
+        return self._size
 
     # TODO: implement this method
     def count(self, item: Any) -> int:
@@ -178,11 +276,9 @@ class LinkedList:
         # 1
         """
         cnt = 0
-        curr = self._first
-        while curr is not None:
-            if item == curr.item:
+        for curr_item in self:
+            if item == curr_item:
                 cnt += 1
-            curr = curr.next
         return cnt
 
     # TODO: implement this method
@@ -202,18 +298,10 @@ class LinkedList:
         # Traceback (most recent call last):
         # ValueError
         """
-        cnt = 0
-        curr = self._first
-        if item == curr.item:
-            return 0
-        while curr is not None:
-            cnt += 1
-            if cnt == len(self):
-                raise ValueError
-            curr = curr.next
-            if item == curr.item:
-                break
-        return cnt
+        for cnt, curr_item in enumerate(self):
+            if item == curr_item:
+                return cnt
+        raise ValueError
 
     # TODO: implement this method
     def __setitem__(self, index: int, item: Any) -> None:
@@ -228,21 +316,25 @@ class LinkedList:
         # >>> str(lst)
         # '[100 -> 200 -> 300]'
         """
-        if index >= len(self.items):
+        if index < 0 or index >= self._size:
             raise IndexError
+        if index == self._size - 1:
+            self._last.item = item
+            return
         curr_index = 0
         curr = self._first
-        if index == 0:
-            curr.item = item
-        else:
-            while curr is not None and curr_index < index:
-                curr = curr.next
-                curr_index += 1
-            curr.item = item
+        while curr_index < index:
+            curr = curr.next
+            curr_index += 1
+        curr.item = item
 
     def delete_node(self, id: int) -> int:
-        """
-        Precondition: k >= 1
+        """Remove the node after position <id> from this list, and return
+        the item at position <id>.
+
+        Raise IndexError if there is no node after position <id>.
+
+        Precondition: id >= 1
         >>> lst = LinkedList([1, 2, 3])
         >>> lst.delete_node(1)
         2
@@ -251,16 +343,132 @@ class LinkedList:
         >>> lst._first.next.item
         2
         """
+        if id + 1 >= self._size:
+            raise IndexError
         curr = self._first
-        if self.is_empty():
-            return self._first.item
-        elif id == 1:
+        for _ in range(id):
             curr = curr.next
-            item = curr.item
-            node = curr.next.next
-            curr.next = node
-            return item
-        curr.next = self.delete_node(id - 1)
+        removed = curr.next
+        curr.next = removed.next
+        if curr.next is None:
+            self._last = curr
+        self._size -= 1
+        return curr.item
+
+    def pop(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it.
+
+        Raise IndexError if index < 0 or index >= len(self).
+
+        >>> lst = LinkedList([1, 2, 3])
+        >>> lst.pop(2)
+        3
+        >>> lst.pop(0)
+        1
+        >>> str(lst), len(lst)
+        ('[2]', 1)
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        if index == 0:
+            removed = self._first
+            self._first = removed.next
+            if self._first is None:
+                self._last = None
+        else:
+            prev = self._first
+            for _ in range(index - 1):
+                prev = prev.next
+            removed = prev.next
+            prev.next = removed.next
+            if prev.next is None:
+                self._last = prev
+        self._size -= 1
+        item = removed.item
+        return item
+
+    def remove_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every item of this list for which <predicate> returns
+        True, in a single pass, and return the number of items removed.
+
+        The list is kept consistent as each node is unlinked, so if
+        <predicate> raises, the items before that point are removed and
+        the list is still usable.
+
+        >>> lst = LinkedList([1, 2, 3, 4, 5, 6])
+        >>> lst.remove_where(lambda item: item % 2 == 0)
+        3
+        >>> str(lst), len(lst)
+        ('[1 -> 3 -> 5]', 3)
+        >>> lst.remove_where(lambda item: 1 / (item - 5) < 0)
+        Traceback (most recent call last):
+        ZeroDivisionError: division by zero
+        >>> lst.append(7)
+        >>> str(lst), len(lst)
+        ('[5 -> 7]', 2)
+        """
+        removed = 0
+        prev = None
+        curr = self._first
+        while curr is not None:
+            nxt = curr.next
+            if predicate(curr.item):
+                if prev is None:
+                    self._first = nxt
+                else:
+                    prev.next = nxt
+                if nxt is None:
+                    self._last = prev
+                self._size -= 1
+                removed += 1
+            else:
+                prev = curr
+            curr = nxt
+        return removed
+
+    def delete_many(self, indices: Iterable[int]) -> List[Any]:
+        """Remove the items at the positions in <indices> from this list,
+        in a single pass, and return them in order.
+
+        Raise IndexError, and leave this list unchanged, if any index is
+        < 0 or >= len(self).
+
+        Precondition: <indices> is sorted in strictly increasing order.
+
+        >>> lst = LinkedList([10, 11, 12, 13, 14])
+        >>> lst.delete_many([0, 2, 4])
+        [10, 12, 14]
+        >>> str(lst), len(lst)
+        ('[11 -> 13]', 2)
+        """
+        indices = list(indices)
+        if not indices:
+            return []
+        if indices[0] < 0 or indices[-1] >= self._size:
+            raise IndexError
+        removed = []
+        prev = None
+        curr = self._first
+        i = 0
+        for index in indices:
+            while i < index:
+                prev = curr
+                curr = curr.next
+                i += 1
+            nxt = curr.next
+            if prev is None:
+                self._first = nxt
+            else:
+                prev.next = nxt
+            removed.append(curr.item)
+            # <prev> stays put; <curr> is now the node originally at i + 1.
+            curr = nxt
+            i += 1
+        if curr is None:
+            self._last = prev
+        self._size -= len(removed)
+        return removed
 
     def keep_biggest(self, other: LinkedList):
         """
@@ -271,24 +479,1168 @@ class LinkedList:
         >>> lst1.keep_biggest(lst2)
         >>> str(lst1)
         '[2 -> 10 -> 0]'
+
+        Comparison stops at the end of the shorter list.
+        >>> lst3 = LinkedList([3, 1, 0])
+        >>> lst3.keep_biggest(LinkedList([1]))
+        >>> str(lst3)
+        '[3 -> 1 -> 0]'
         """
         curr1 = self._first
         curr2 = other._first
+        if curr1 is None or curr2 is None:
+            return
         if curr1.item < curr2.item:
             curr1 = curr1.next
-        while curr1 is not None and curr2 is not None:
+        while curr1 is not None and curr1.next is not None and \
+                curr2.next is not None:
             if curr1.next.item < curr2.next.item and \
                     curr1.next.next is not None:
                 tmp = curr1.next.next
                 curr1.next = tmp
+                self._size -= 1
             elif curr1.next.item < curr2.next.item:
                 curr1.item = curr1.next.item
                 curr1.next = None
+                self._last = curr1
+                self._size -= 1
                 break
             curr1 = curr1.next
             curr2 = curr2.next
 
 
+class CursorLinkedList:
+    """An array-backed implementation of the List ADT, with the same public
+    interface as LinkedList.
+
+    Instead of node objects, items and next links are stored in two
+    parallel columns indexed by "slot": _items[slot] is the item stored in
+    a slot, and _next[slot] is the slot of the next item, or NO_SLOT. This
+    saves the per-node object overhead, keeps the links in one contiguous
+    array.array, and makes the whole list picklable as two flat columns.
+
+    Slots freed by deletions are kept on a stack and reused first.
+
+    >>> lst = CursorLinkedList([1, 2, 3])
+    >>> lst.insert(1, 10)
+    >>> lst.append(4)
+    >>> str(lst), len(lst)
+    ('[1 -> 10 -> 2 -> 3 -> 4]', 5)
+    >>> lst.delete_node(1)
+    10
+    >>> lst.append(5)  # Reuses the slot freed by delete_node
+    >>> str(lst), len(lst._items)
+    ('[1 -> 10 -> 3 -> 4 -> 5]', 5)
+    """
+    # === Private Attributes ===
+    # _items:
+    #     The item stored in each slot; free slots hold None.
+    # _next:
+    #     The slot of the next item after each slot, or NO_SLOT.
+    # _first:
+    #     The slot of the first item, or NO_SLOT if the list is empty.
+    # _last:
+    #     The slot of the last item, or NO_SLOT if the list is empty.
+    # _size:
+    #     The number of items in the list.
+    # _free:
+    #     A stack of the slots that hold no item.
+    # _in_slot_order:
+    #     Whether the items are in slots 0, 1, 2, ... in list order, so
+    #     that _items can be scanned directly. This holds as long as the
+    #     list has only been appended to.
+    _items: List[Any]
+    _next: array
+    _first: int
+    _last: int
+    _size: int
+    _free: List[int]
+    _in_slot_order: bool
+
+    def __init__(self, items: Iterable) -> None:
+        """Initialize a new linked list containing the given items.
+        """
+        self._items = []
+        self._next = array('q')
+        self._first = NO_SLOT
+        self._last = NO_SLOT
+        self._size = 0
+        self._free = []
+        self._in_slot_order = True
+        self.extend(items)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable) -> CursorLinkedList:
+        """Return a new linked list containing the items of <items>.
+        """
+        return cls(items)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list.
+        """
+        items = self._items
+        nxt = self._next
+        slot = self._first
+        while slot != NO_SLOT:
+            yield items[slot]
+            slot = nxt[slot]
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, last first.
+        """
+        return reversed(list(self))
+
+    def extend(self, items: Iterable) -> None:
+        """Append the items of <items> to the end of this list.
+        """
+        if items is self:
+            items = list(items)
+        for item in items:
+            self.append(item)
+
+    def _new_slot(self, item: Any) -> int:
+        """Store <item> in a free slot, with no next slot, and return the
+        slot.
+        """
+        if self._free:
+            slot = self._free.pop()
+            self._items[slot] = item
+            self._next[slot] = NO_SLOT
+            return slot
+        self._items.append(item)
+        self._next.append(NO_SLOT)
+        return len(self._items) - 1
+
+    def _free_slot(self, slot: int) -> None:
+        """Mark <slot>, which must no longer be linked, as free.
+        """
+        self._in_slot_order = False
+        self._items[slot] = None
+        self._free.append(slot)
+
+    def _slot_at(self, index: int) -> int:
+        """Return the slot of the item at position <index>.
+
+        Precondition: 0 <= index < len(self)
+        """
+        if index == self._size - 1:
+            return self._last
+        nxt = self._next
+        slot = self._first
+        for _ in range(index):
+            slot = nxt[slot]
+        return slot
+
+    def is_empty(self) -> bool:
+        """Return whether this linked list is empty.
+        """
+        return self._first == NO_SLOT
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+        """
+        return '[' + ' -> '.join(str(item) for item in self) + ']'
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+        """
+        return self._size
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+
+        Raise IndexError if <index> is >= the length of this list.
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        return self._items[self._slot_at(index)]
+
+    def __setitem__(self, index: int, item: Any) -> None:
+        """Store item at position <index> in this list.
+
+        Raise IndexError if index >= len(self).
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        self._items[self._slot_at(index)] = item
+
+    def insert(self, index: int, item: Any) -> None:
+        """Insert the given item at the given index in this list.
+
+        Raise IndexError if index > len(self) or index < 0.
+        Note that adding to the end of the list is okay.
+        """
+        if index < 0 or index > self._size:
+            raise IndexError
+        if index == 0:
+            self.appendleft(item)
+        elif index == self._size:
+            self.append(item)
+        else:
+            prev = self._slot_at(index - 1)
+            slot = self._new_slot(item)
+            self._in_slot_order = False
+            self._next[slot] = self._next[prev]
+            self._next[prev] = slot
+            self._size += 1
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list, in constant time.
+        """
+        slot = self._new_slot(item)
+        if self._last == NO_SLOT:
+            self._first = slot
+        else:
+            self._next[self._last] = slot
+        self._last = slot
+        self._size += 1
+
+    def appendleft(self, item: Any) -> None:
+        """Add <item> to the front of this list, in constant time.
+        """
+        slot = self._new_slot(item)
+        self._in_slot_order = False
+        self._next[slot] = self._first
+        self._first = slot
+        if self._last == NO_SLOT:
+            self._last = slot
+        self._size += 1
+
+    def count(self, item: Any) -> int:
+        """Return the number of times <item> occurs in this list.
+
+        Use == to compare items.
+        """
+        if self._in_slot_order:
+            return self._items.count(item)
+        cnt = 0
+        for curr_item in self:
+            if item == curr_item:
+                cnt += 1
+        return cnt
+
+    def index(self, item: Any) -> int:
+        """Return the index of the first occurrence of <item> in this list.
+
+        Raise ValueError if the <item> is not present.
+
+        Use == to compare items.
+        """
+        if self._in_slot_order:
+            return self._items.index(item)
+        for cnt, curr_item in enumerate(self):
+            if item == curr_item:
+                return cnt
+        raise ValueError
+
+    def delete_node(self, id: int) -> int:
+        """Remove the node after position <id> from this list, and return
+        the item at position <id>.
+
+        Raise IndexError if there is no node after position <id>.
+
+        Precondition: id >= 1
+        >>> lst = CursorLinkedList([1, 2, 3])
+        >>> lst.delete_node(1)
+        2
+        >>> str(lst)
+        '[1 -> 2]'
+        """
+        if id + 1 >= self._size:
+            raise IndexError
+        slot = self._slot_at(id)
+        removed = self._next[slot]
+        self._next[slot] = self._next[removed]
+        self._free_slot(removed)
+        if self._next[slot] == NO_SLOT:
+            self._last = slot
+        self._size -= 1
+        return self._items[slot]
+
+    def pop(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it.
+
+        Raise IndexError if index < 0 or index >= len(self).
+
+        >>> lst = CursorLinkedList([1, 2, 3])
+        >>> lst.pop(2), lst.pop(0), str(lst), len(lst)
+        (3, 1, '[2]', 1)
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        nxt = self._next
+        if index == 0:
+            slot = self._first
+            self._first = nxt[slot]
+            if self._first == NO_SLOT:
+                self._last = NO_SLOT
+        else:
+            prev = self._slot_at(index - 1)
+            slot = nxt[prev]
+            nxt[prev] = nxt[slot]
+            if nxt[prev] == NO_SLOT:
+                self._last = prev
+        self._size -= 1
+        item = self._items[slot]
+        self._free_slot(slot)
+        return item
+
+    def remove_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every item of this list for which <predicate> returns
+        True, in a single pass, and return the number of items removed.
+
+        As for LinkedList.remove_where, the list stays consistent if
+        <predicate> raises.
+
+        >>> lst = CursorLinkedList([1, 2, 3, 4, 5, 6])
+        >>> lst.remove_where(lambda item: item % 2 == 0)
+        3
+        >>> str(lst), len(lst)
+        ('[1 -> 3 -> 5]', 3)
+        """
+        items = self._items
+        nxt = self._next
+        removed = 0
+        prev = NO_SLOT
+        slot = self._first
+        while slot != NO_SLOT:
+            following = nxt[slot]
+            if predicate(items[slot]):
+                if prev == NO_SLOT:
+                    self._first = following
+                else:
+                    nxt[prev] = following
+                if following == NO_SLOT:
+                    self._last = prev
+                self._size -= 1
+                self._free_slot(slot)
+                removed += 1
+            else:
+                prev = slot
+            slot = following
+        return removed
+
+    def delete_many(self, indices: Iterable[int]) -> List[Any]:
+        """Remove the items at the positions in <indices> from this list,
+        in a single pass, and return them in order.
+
+        Raise IndexError, and leave this list unchanged, if any index is
+        < 0 or >= len(self).
+
+        Precondition: <indices> is sorted in strictly increasing order.
+
+        >>> lst = CursorLinkedList([10, 11, 12, 13, 14])
+        >>> lst.delete_many([0, 2, 4])
+        [10, 12, 14]
+        >>> str(lst), len(lst)
+        ('[11 -> 13]', 2)
+        """
+        indices = list(indices)
+        if not indices:
+            return []
+        if indices[0] < 0 or indices[-1] >= self._size:
+            raise IndexError
+        nxt = self._next
+        removed = []
+        prev = NO_SLOT
+        slot = self._first
+        i = 0
+        for index in indices:
+            while i < index:
+                prev = slot
+                slot = nxt[slot]
+                i += 1
+            following = nxt[slot]
+            if prev == NO_SLOT:
+                self._first = following
+            else:
+                nxt[prev] = following
+            removed.append(self._items[slot])
+            self._free_slot(slot)
+            # <prev> stays put; <slot> is now the one originally at i + 1.
+            slot = following
+            i += 1
+        if slot == NO_SLOT:
+            self._last = prev
+        self._size -= len(removed)
+        return removed
+
+    def keep_biggest(self, other: CursorLinkedList) -> None:
+        """The same as LinkedList.keep_biggest.
+
+        >>> lst1 = CursorLinkedList([2, 5, 10, 12, 0])
+        >>> lst2 = CursorLinkedList([1, 20, 10, 99])
+        >>> lst1.keep_biggest(lst2)
+        >>> str(lst1)
+        '[2 -> 10 -> 0]'
+        """
+        items1, nxt1 = self._items, self._next
+        items2, nxt2 = other._items, other._next
+        curr1 = self._first
+        curr2 = other._first
+        if curr1 == NO_SLOT or curr2 == NO_SLOT:
+            return
+        if items1[curr1] < items2[curr2]:
+            curr1 = nxt1[curr1]
+        while curr1 != NO_SLOT and nxt1[curr1] != NO_SLOT and \
+                nxt2[curr2] != NO_SLOT:
+            next1 = nxt1[curr1]
+            if items1[next1] < items2[nxt2[curr2]] and \
+                    nxt1[next1] != NO_SLOT:
+                nxt1[curr1] = nxt1[next1]
+                self._free_slot(next1)
+                self._size -= 1
+            elif items1[next1] < items2[nxt2[curr2]]:
+                items1[curr1] = items1[next1]
+                nxt1[curr1] = NO_SLOT
+                self._free_slot(next1)
+                self._last = curr1
+                self._size -= 1
+                break
+            curr1 = nxt1[curr1]
+            curr2 = nxt2[curr2]
+
+
+class _SkipNode:
+    """A node in a SkipLinkedList.
+
+    === Attributes ===
+    item:
+        The data stored in this node.
+    next:
+        next[level] is the next node at that level, or None. Level 0 links
+        every node, like _Node.next; each higher level skips over more
+        nodes.
+    width:
+        width[level] is the number of level-0 steps from this node to
+        next[level]. It is meaningless when next[level] is None.
+    """
+    __slots__ = ('item', 'next', 'width')
+    item: Any
+    next: List[Optional[_SkipNode]]
+    width: List[int]
+
+    def __init__(self, item: Any, levels: int) -> None:
+        """Initialize a new node storing <item>, with <levels> levels and no
+        next nodes.
+        """
+        self.item = item
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class SkipLinkedList:
+    """An indexable skip list implementation of the List ADT, with the same
+    public interface as LinkedList.
+
+    On top of the level-0 chain, each node has a random number of
+    "express" links, which skip over about 2 ** level nodes, and each link
+    stores how many nodes it skips (its width). Positional operations add
+    up widths on the way down from the top level, so __getitem__,
+    __setitem__, insert and delete_node take O(log n) expected time
+    instead of O(n).
+
+    >>> lst = SkipLinkedList([1, 2, 3])
+    >>> lst.insert(1, 10)
+    >>> lst[1], lst[3]
+    (10, 3)
+    >>> lst.delete_node(1)
+    10
+    >>> str(lst), len(lst)
+    ('[1 -> 10 -> 3]', 3)
+    """
+    # === Private Attributes ===
+    # _head:
+    #     A sentinel node, with SKIP_MAX_LEVEL levels, before the first
+    #     item. Its item is not part of the list.
+    # _levels:
+    #     The number of levels in use; no node has more.
+    # _size:
+    #     The number of items in the list.
+    _head: _SkipNode
+    _levels: int
+    _size: int
+
+    def __init__(self, items: Iterable) -> None:
+        """Initialize a new linked list containing the given items.
+        """
+        self._head = _SkipNode(None, SKIP_MAX_LEVEL)
+        self._levels = 1
+        self._size = 0
+        self.extend(items)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable) -> SkipLinkedList:
+        """Return a new linked list containing the items of <items>.
+        """
+        return cls(items)
+
+    def _find(self, index: int) -> Tuple[List[_SkipNode], List[int]]:
+        """Return, for each level in use, the last node at that level that
+        comes before the item at position <index> (the head, if there is
+        none), and the position of each of those nodes.
+
+        Positions count the head as position 0, so the item at <index> is
+        at position index + 1.
+
+        Precondition: 0 <= index <= len(self)
+        """
+        update = [self._head] * self._levels
+        positions = [0] * self._levels
+        node = self._head
+        pos = 0
+        for level in range(self._levels - 1, -1, -1):
+            while node.next[level] is not None and \
+                    pos + node.width[level] <= index:
+                pos += node.width[level]
+                node = node.next[level]
+            update[level] = node
+            positions[level] = pos
+        return update, positions
+
+    def _node_at(self, index: int) -> _SkipNode:
+        """Return the node at position <index>.
+
+        Raise IndexError if index < 0 or index >= len(self).
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        return self._find(index)[0][0].next[0]
+
+    def is_empty(self) -> bool:
+        """Return whether this linked list is empty.
+        """
+        return self._size == 0
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+        """
+        return '[' + ' -> '.join(str(item) for item in self) + ']'
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+        """
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list.
+        """
+        curr = self._head.next[0]
+        while curr is not None:
+            yield curr.item
+            curr = curr.next[0]
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, last first.
+        """
+        return reversed(list(self))
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+
+        Raise IndexError if <index> is >= the length of this list.
+        """
+        return self._node_at(index).item
+
+    def __setitem__(self, index: int, item: Any) -> None:
+        """Store item at position <index> in this list.
+
+        Raise IndexError if index >= len(self).
+        """
+        self._node_at(index).item = item
+
+    def insert(self, index: int, item: Any) -> None:
+        """Insert the given item at the given index in this list.
+
+        Raise IndexError if index > len(self) or index < 0.
+        Note that adding to the end of the list is okay.
+        """
+        if index < 0 or index > self._size:
+            raise IndexError
+        levels = _random_levels()
+        if levels > self._levels:
+            # The head's links at the new levels run to the end of the list.
+            for level in range(self._levels, levels):
+                self._head.next[level] = None
+            self._levels = levels
+
+        update, positions = self._find(index)
+        new_node = _SkipNode(item, levels)
+        for level in range(self._levels):
+            prev = update[level]
+            if level < levels:
+                # The new node goes at position index + 1 (see _find).
+                skipped = index - positions[level]
+                new_node.next[level] = prev.next[level]
+                new_node.width[level] = prev.width[level] - skipped
+                prev.next[level] = new_node
+                prev.width[level] = skipped + 1
+            elif prev.next[level] is not None:
+                prev.width[level] += 1
+        self._size += 1
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list.
+        """
+        self.insert(self._size, item)
+
+    def appendleft(self, item: Any) -> None:
+        """Add <item> to the front of this list.
+        """
+        self.insert(0, item)
+
+    def extend(self, items: Iterable) -> None:
+        """Append the items of <items> to the end of this list.
+        """
+        if items is self:
+            items = list(items)
+        for item in items:
+            self.append(item)
+
+    def count(self, item: Any) -> int:
+        """Return the number of times <item> occurs in this list.
+
+        Use == to compare items.
+        """
+        cnt = 0
+        for curr_item in self:
+            if item == curr_item:
+                cnt += 1
+        return cnt
+
+    def index(self, item: Any) -> int:
+        """Return the index of the first occurrence of <item> in this list.
+
+        Raise ValueError if the <item> is not present.
+
+        Use == to compare items.
+        """
+        for cnt, curr_item in enumerate(self):
+            if item == curr_item:
+                return cnt
+        raise ValueError
+
+    def _remove(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it.
+
+        Precondition: 0 <= index < len(self)
+        """
+        update = self._find(index)[0]
+        target = update[0].next[0]
+        for level in range(self._levels):
+            prev = update[level]
+            if prev.next[level] is target:
+                prev.width[level] += target.width[level] - 1
+                prev.next[level] = target.next[level]
+            elif prev.next[level] is not None:
+                prev.width[level] -= 1
+        while self._levels > 1 and self._head.next[self._levels - 1] is None:
+            self._levels -= 1
+        self._size -= 1
+        return target.item
+
+    def pop(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it, in O(log n) expected time.
+
+        Raise IndexError if index < 0 or index >= len(self).
+
+        >>> lst = SkipLinkedList([1, 2, 3])
+        >>> lst.pop(2), lst.pop(0), str(lst), len(lst)
+        (3, 1, '[2]', 1)
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        return self._remove(index)
+
+    def remove_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every item of this list for which <predicate> returns
+        True, and return the number of items removed.
+
+        <predicate> is called on every item first, and the list is then
+        rebuilt from the rest in O(n) time, so if <predicate> raises, the
+        list is unchanged.
+
+        >>> lst = SkipLinkedList([1, 2, 3, 4, 5, 6])
+        >>> lst.remove_where(lambda item: item % 2 == 0)
+        3
+        >>> str(lst), len(lst)
+        ('[1 -> 3 -> 5]', 3)
+        """
+        kept = [item for item in self if not predicate(item)]
+        removed = self._size - len(kept)
+        if removed:
+            self.__init__(kept)
+        return removed
+
+    def delete_many(self, indices: Iterable[int]) -> List[Any]:
+        """Remove the items at the positions in <indices> from this list,
+        and return them in order.
+
+        Each item is removed in O(log n) expected time, last first, so the
+        positions of the others do not move.
+
+        Raise IndexError, and leave this list unchanged, if any index is
+        < 0 or >= len(self).
+
+        Precondition: <indices> is sorted in strictly increasing order.
+
+        >>> lst = SkipLinkedList([10, 11, 12, 13, 14])
+        >>> lst.delete_many([0, 2, 4])
+        [10, 12, 14]
+        >>> str(lst), len(lst)
+        ('[11 -> 13]', 2)
+        """
+        indices = list(indices)
+        if not indices:
+            return []
+        if indices[0] < 0 or indices[-1] >= self._size:
+            raise IndexError
+        removed = [self._remove(index) for index in reversed(indices)]
+        removed.reverse()
+        return removed
+
+    def delete_node(self, id: int) -> int:
+        """Remove the node after position <id> from this list, and return
+        the item at position <id>.
+
+        Raise IndexError if there is no node after position <id>.
+
+        Precondition: id >= 1
+        >>> lst = SkipLinkedList([1, 2, 3])
+        >>> lst.delete_node(1)
+        2
+        >>> str(lst)
+        '[1 -> 2]'
+        """
+        if id + 1 >= self._size:
+            raise IndexError
+        self._remove(id + 1)
+        return self[id]
+
+    def keep_biggest(self, other: SkipLinkedList) -> None:
+        """The same as LinkedList.keep_biggest.
+
+        This runs LinkedList.keep_biggest on copies of both lists and
+        rebuilds this list from the result, which is O(n) like the
+        original.
+
+        >>> lst1 = SkipLinkedList([2, 5, 10, 12, 0])
+        >>> lst1.keep_biggest(SkipLinkedList([1, 20, 10, 99]))
+        >>> str(lst1)
+        '[2 -> 10 -> 0]'
+        """
+        result = LinkedList(self)
+        result.keep_biggest(LinkedList(other))
+        self.__init__(result)
+
+
+def _random_levels() -> int:
+    """Return a random number of levels for a new SkipLinkedList node:
+    1 with probability 1/2, 2 with probability 1/4, and so on, up to
+    SKIP_MAX_LEVEL.
+    """
+    levels = 1
+    while levels < SKIP_MAX_LEVEL and random.random() < 0.5:
+        levels += 1
+    return levels
+
+
+class _Chunk:
+    """A node in an UnrolledLinkedList, holding up to the list's capacity
+    of items.
+
+    === Attributes ===
+    items:
+        The items stored in this node, in order.
+    next:
+        The next node in the list, or None if there are no more nodes.
+    """
+    __slots__ = ('items', 'next')
+    items: List[Any]
+    next: Optional[_Chunk]
+
+    def __init__(self, items: List[Any]) -> None:
+        """Initialize a new node storing <items>, with no next node.
+        """
+        self.items = items
+        self.next = None
+
+
+class UnrolledLinkedList:
+    """An unrolled linked list implementation of the List ADT, with the
+    same public interface as LinkedList.
+
+    Each node stores up to <capacity> items in a Python list, so there are
+    about capacity times fewer nodes to allocate and to follow. count and
+    index scan each node's items with list.count and list.index.
+
+    A node that grows past <capacity> items is split in two; a node that
+    shrinks below half of <capacity> takes items from the next node, or
+    merges with it if they fit in one node.
+
+    >>> lst = UnrolledLinkedList(range(5), capacity=2)
+    >>> lst.insert(1, 10)
+    >>> str(lst), len(lst)
+    ('[0 -> 10 -> 1 -> 2 -> 3 -> 4]', 6)
+    >>> [len(chunk.items) for chunk in lst._chunks()]
+    [1, 2, 2, 1]
+    """
+    # === Private Attributes ===
+    # _first:
+    #     The first node in the list, or None if the list is empty.
+    # _last:
+    #     The last node in the list, or None if the list is empty.
+    # _size:
+    #     The number of items in the list.
+    # _capacity:
+    #     The most items a node can hold.
+    #
+    # === Representation Invariants ===
+    # No node is empty, and no node has more than _capacity items.
+    _first: Optional[_Chunk]
+    _last: Optional[_Chunk]
+    _size: int
+    _capacity: int
+
+    def __init__(self, items: Iterable,
+                 capacity: int = UNROLLED_CAPACITY) -> None:
+        """Initialize a new linked list containing the given items, with
+        up to <capacity> items per node.
+
+        Precondition: capacity >= 2
+        """
+        self._first = None
+        self._last = None
+        self._size = 0
+        self._capacity = capacity
+        self.extend(items)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable,
+                      capacity: int = UNROLLED_CAPACITY) \
+            -> UnrolledLinkedList:
+        """Return a new linked list containing the items of <items>.
+        """
+        return cls(items, capacity)
+
+    def _chunks(self) -> Iterator[_Chunk]:
+        """Return an iterator over the nodes of this list.
+        """
+        chunk = self._first
+        while chunk is not None:
+            yield chunk
+            chunk = chunk.next
+
+    def _locate(self, index: int) -> Tuple[Optional[_Chunk], _Chunk, int]:
+        """Return the node holding the item at position <index>, the node
+        before it (or None), and the item's position within the node.
+
+        Precondition: 0 <= index < len(self)
+        """
+        if index >= self._size - len(self._last.items):
+            # The last node is common (appends, and reads at the end);
+            # its previous node is only needed for deletions, so look it
+            # up lazily there.
+            return None, self._last, \
+                index - (self._size - len(self._last.items))
+        prev = None
+        chunk = self._first
+        while index >= len(chunk.items):
+            index -= len(chunk.items)
+            prev = chunk
+            chunk = chunk.next
+        return prev, chunk, index
+
+    def is_empty(self) -> bool:
+        """Return whether this linked list is empty.
+        """
+        return self._first is None
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+        """
+        return '[' + ' -> '.join(str(item) for item in self) + ']'
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+        """
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list.
+        """
+        for chunk in self._chunks():
+            yield from chunk.items
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, last first.
+        """
+        return reversed(list(self))
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+
+        Raise IndexError if <index> is >= the length of this list.
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        _, chunk, offset = self._locate(index)
+        return chunk.items[offset]
+
+    def __setitem__(self, index: int, item: Any) -> None:
+        """Store item at position <index> in this list.
+
+        Raise IndexError if index >= len(self).
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        _, chunk, offset = self._locate(index)
+        chunk.items[offset] = item
+
+    def insert(self, index: int, item: Any) -> None:
+        """Insert the given item at the given index in this list.
+
+        Raise IndexError if index > len(self) or index < 0.
+        Note that adding to the end of the list is okay.
+        """
+        if index < 0 or index > self._size:
+            raise IndexError
+        if index == self._size:
+            self.append(item)
+            return
+        _, chunk, offset = self._locate(index)
+        chunk.items.insert(offset, item)
+        self._size += 1
+        if len(chunk.items) > self._capacity:
+            self._split(chunk)
+
+    def _split(self, chunk: _Chunk) -> None:
+        """Move the second half of the items of <chunk> to a new node after
+        it.
+        """
+        half = len(chunk.items) // 2
+        new_chunk = _Chunk(chunk.items[half:])
+        del chunk.items[half:]
+        new_chunk.next = chunk.next
+        chunk.next = new_chunk
+        if self._last is chunk:
+            self._last = new_chunk
+
+    def append(self, item: Any) -> None:
+        """Add <item> to the end of this list.
+        """
+        if self._last is None:
+            self._first = self._last = _Chunk([item])
+        elif len(self._last.items) < self._capacity:
+            self._last.items.append(item)
+        else:
+            self._last.next = _Chunk([item])
+            self._last = self._last.next
+        self._size += 1
+
+    def appendleft(self, item: Any) -> None:
+        """Add <item> to the front of this list.
+        """
+        self.insert(0, item)
+
+    def extend(self, items: Iterable) -> None:
+        """Append the items of <items> to the end of this list.
+        """
+        if items is self:
+            items = list(items)
+        for item in items:
+            self.append(item)
+
+    def count(self, item: Any) -> int:
+        """Return the number of times <item> occurs in this list.
+
+        Use == to compare items.
+        """
+        return sum(chunk.items.count(item) for chunk in self._chunks())
+
+    def index(self, item: Any) -> int:
+        """Return the index of the first occurrence of <item> in this list.
+
+        Raise ValueError if the <item> is not present.
+
+        Use == to compare items.
+        """
+        base = 0
+        for chunk in self._chunks():
+            if item in chunk.items:
+                return base + chunk.items.index(item)
+            base += len(chunk.items)
+        raise ValueError
+
+    def _remove(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it.
+
+        Precondition: 0 <= index < len(self)
+        """
+        prev, chunk, offset = self._locate(index)
+        item = chunk.items.pop(offset)
+        self._size -= 1
+        if not chunk.items:
+            # Unlink the empty node. _locate does not find the node before
+            # the last one, so look for it here if needed.
+            if prev is None and chunk is not self._first:
+                prev = self._first
+                while prev.next is not chunk:
+                    prev = prev.next
+            if prev is None:
+                self._first = chunk.next
+            else:
+                prev.next = chunk.next
+            if self._last is chunk:
+                self._last = prev
+        elif len(chunk.items) < self._capacity // 2 and \
+                chunk.next is not None:
+            following = chunk.next
+            if len(chunk.items) + len(following.items) <= self._capacity:
+                chunk.items.extend(following.items)
+                chunk.next = following.next
+                if self._last is following:
+                    self._last = chunk
+            else:
+                take = len(following.items) // 2
+                chunk.items.extend(following.items[:take])
+                del following.items[:take]
+        return item
+
+    def pop(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it.
+
+        Raise IndexError if index < 0 or index >= len(self).
+
+        >>> lst = UnrolledLinkedList([1, 2, 3])
+        >>> lst.pop(2), lst.pop(0), str(lst), len(lst)
+        (3, 1, '[2]', 1)
+        """
+        if index < 0 or index >= self._size:
+            raise IndexError
+        return self._remove(index)
+
+    def remove_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every item of this list for which <predicate> returns
+        True, in a single pass, and return the number of items removed.
+
+        >>> lst = UnrolledLinkedList(range(1, 7), capacity=2)
+        >>> lst.remove_where(lambda item: item % 2 == 0)
+        3
+        >>> str(lst), [len(chunk.items) for chunk in lst._chunks()]
+        ('[1 -> 3 -> 5]', [2, 1])
+        """
+        return len(self._filter(lambda index, item: predicate(item)))
+
+    def delete_many(self, indices: Iterable[int]) -> List[Any]:
+        """Remove the items at the positions in <indices> from this list,
+        in a single pass, and return them in order.
+
+        Raise IndexError, and leave this list unchanged, if any index is
+        < 0 or >= len(self).
+
+        Precondition: <indices> is sorted in strictly increasing order.
+
+        >>> lst = UnrolledLinkedList([10, 11, 12, 13, 14], capacity=2)
+        >>> lst.delete_many([0, 2, 4])
+        [10, 12, 14]
+        >>> str(lst), len(lst)
+        ('[11 -> 13]', 2)
+        """
+        indices = list(indices)
+        if not indices:
+            return []
+        if indices[0] < 0 or indices[-1] >= self._size:
+            raise IndexError
+        wanted = set(indices)
+        return self._filter(lambda index, item: index in wanted)
+
+    def _filter(self, select: Callable[[int, Any], bool]) -> List[Any]:
+        """Remove every item for which select(index, item) returns True,
+        where index is the item's position before any removal, and return
+        the removed items in order.
+
+        A node's items are only replaced once <select> has been called on
+        all of them, so if <select> raises, the list is still consistent.
+        Emptied nodes are unlinked, and a node whose remaining items fit
+        into the node before it is merged into that node.
+        """
+        removed = []
+        prev = None
+        chunk = self._first
+        base = 0
+        while chunk is not None:
+            kept = []
+            gone = []
+            for offset, item in enumerate(chunk.items):
+                if select(base + offset, item):
+                    gone.append(item)
+                else:
+                    kept.append(item)
+            base += len(chunk.items)
+            following = chunk.next
+            if not gone:
+                prev = chunk
+            elif prev is not None and \
+                    len(prev.items) + len(kept) <= self._capacity:
+                prev.items.extend(kept)
+                prev.next = following
+                if self._last is chunk:
+                    self._last = prev
+            elif kept:
+                chunk.items = kept
+                prev = chunk
+            else:
+                # The first node is empty now.
+                self._first = following
+                if self._last is chunk:
+                    self._last = None
+            self._size -= len(gone)
+            removed.extend(gone)
+            chunk = following
+        return removed
+
+    def delete_node(self, id: int) -> int:
+        """Remove the item after position <id> from this list, and return
+        the item at position <id>.
+
+        Raise IndexError if there is no item after position <id>.
+
+        Precondition: id >= 1
+        >>> lst = UnrolledLinkedList([1, 2, 3])
+        >>> lst.delete_node(1)
+        2
+        >>> str(lst)
+        '[1 -> 2]'
+        """
+        if id + 1 >= self._size:
+            raise IndexError
+        self._remove(id + 1)
+        return self[id]
+
+    def keep_biggest(self, other: UnrolledLinkedList) -> None:
+        """The same as LinkedList.keep_biggest.
+
+        Like SkipLinkedList.keep_biggest, this works on LinkedList copies.
+
+        >>> lst1 = UnrolledLinkedList([2, 5, 10, 12, 0])
+        >>> lst1.keep_biggest(UnrolledLinkedList([1, 20, 10, 99]))
+        >>> str(lst1)
+        '[2 -> 10 -> 0]'
+        """
+        result = LinkedList(self)
+        result.keep_biggest(LinkedList(other))
+        self.__init__(result, self._capacity)
+
+
 if __name__ == '__main__':
     # import python_ta
     # python_ta.check_all()
@@ -0,0 +1,377 @@
+"""Linked list benchmarks
+
+=== Module Description ===
+This module measures the linked list classes in this repository. Run it
+directly:
+
+    python linked_list_benchmark.py memory
+    python linked_list_benchmark.py positional
+    python linked_list_benchmark.py chunks
+    python linked_list_benchmark.py contention
+    python linked_list_benchmark.py persistent
+    python linked_list_benchmark.py deque
+    python linked_list_benchmark.py cache
+    python linked_list_benchmark.py window
+    python linked_list_benchmark.py queue
+"""
+import queue
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple
+
+from cache import LFUCache, LRUCache, cached
+from concurrent_linked import ConcurrentQueue
+from doubly import DoublyLinkedList, RingBuffer, SlidingWindow
+from linked_list import LinkedList, SkipLinkedList, UnrolledLinkedList
+from persistent_list import PersistentList
+from queue_linked_list import Queue
+
+
+class _DictNode:
+    """A linked list node with a __dict__, as _Node was before it had
+    __slots__. Used as the baseline for memory measurements.
+    """
+    item: Any
+    next: Optional['_DictNode']
+
+    def __init__(self, item: Any) -> None:
+        self.item = item
+        self.next = None
+
+
+def _dict_chain(items: list) -> _DictNode:
+    """Return the first of a chain of _DictNodes holding <items>.
+    """
+    first = curr = _DictNode(items[0])
+    for i in range(1, len(items)):
+        curr.next = _DictNode(items[i])
+        curr = curr.next
+    return first
+
+
+def bytes_allocated(build: Callable[[list], Any], items: list) -> int:
+    """Return the number of bytes allocated, and still in use, by
+    build(items), as measured by tracemalloc.
+
+    <items> already exists, so only the structure itself is measured.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(items)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bytes_per_item(build: Callable[[list], Any], items: list) -> float:
+    """Return bytes_allocated(build, items) per item of <items>.
+    """
+    return bytes_allocated(build, items) / len(items)
+
+
+def memory_main() -> None:
+    """Print the bytes per item of dict-based nodes (the baseline),
+    LinkedList and DoublyLinkedList.
+    """
+    for n in (10 ** 4, 10 ** 5, 10 ** 6):
+        items = list(range(n))
+        print(f'n={n:>8}  '
+              f'dict nodes {bytes_per_item(_dict_chain, items):6.1f} B  '
+              f'LinkedList {bytes_per_item(LinkedList, items):6.1f} B  '
+              f'DoublyLinkedList '
+              f'{bytes_per_item(DoublyLinkedList, items):6.1f} B')
+
+
+def positional_ops(lst: Any, ops: int) -> float:
+    """Return the wall time, in seconds, of <ops> random reads followed by
+    <ops> random inserts on <lst>.
+    """
+    n = len(lst)
+    reads = [random.randrange(n) for _ in range(ops)]
+    inserts = [random.randrange(n) for _ in range(ops)]
+    t0 = time.perf_counter()
+    for i in reads:
+        lst[i]
+    for i in inserts:
+        lst.insert(i, i)
+    return time.perf_counter() - t0
+
+
+def positional_main() -> None:
+    """Print the time of random positional reads and inserts on LinkedList
+    and SkipLinkedList.
+    """
+    ops = 1000
+    for n in (10 ** 3, 10 ** 4, 10 ** 5):
+        chain = positional_ops(LinkedList(range(n)), ops)
+        skip = positional_ops(SkipLinkedList(range(n)), ops)
+        print(f'n={n:>8}  {ops} reads + {ops} inserts  '
+              f'LinkedList {chain:8.4f}s  SkipLinkedList {skip:8.4f}s  '
+              f'speedup {chain / skip:6.1f}x')
+
+
+def scan_and_insert(lst: Any, ops: int) -> Tuple[float, float]:
+    """Return the wall time, in seconds, of <ops> full scans of <lst> with
+    count, and of <ops> inserts at random positions into <lst>.
+    """
+    n = len(lst)
+    inserts = [random.randrange(n) for _ in range(ops)]
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        lst.count(-1)
+    t1 = time.perf_counter()
+    for i in inserts:
+        lst.insert(i, i)
+    return t1 - t0, time.perf_counter() - t1
+
+
+def chunks_main() -> None:
+    """Print scan and insert throughput, in items per second, of
+    LinkedList and of UnrolledLinkedList at several node capacities.
+    """
+    n = 10 ** 5
+    ops = 100
+    lists = [('LinkedList', LinkedList(range(n)))]
+    for capacity in (8, 16, 32, 64, 128, 256):
+        lists.append((f'Unrolled({capacity})',
+                      UnrolledLinkedList(range(n), capacity)))
+    for name, lst in lists:
+        scan, insert = scan_and_insert(lst, ops)
+        print(f'{name:>15}  scan {n * ops / scan:12.0f} items/s  '
+              f'insert {ops / insert:10.0f} items/s')
+
+
+def producer_consumer(q: Any, threads: int, items: int) -> float:
+    """Return the wall time, in seconds, for <threads> producer threads to
+    put <items> items in total through <q>, while <threads> consumer
+    threads get them all.
+    """
+    per_thread = items // threads
+
+    def produce() -> None:
+        for i in range(per_thread):
+            q.put(i)
+
+    def consume() -> None:
+        for _ in range(per_thread):
+            q.get()
+
+    workers = [threading.Thread(target=produce) for _ in range(threads)] + \
+        [threading.Thread(target=consume) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - t0
+
+
+def contention_main() -> None:
+    """Print the throughput of ConcurrentQueue and queue.Queue with 1 to 16
+    producer threads and as many consumer threads.
+    """
+    items = 2 * 10 ** 5
+    for threads in (1, 2, 4, 8, 16):
+        linked = producer_consumer(ConcurrentQueue(), threads, items)
+        stdlib = producer_consumer(queue.Queue(), threads, items)
+        print(f'threads={threads:>2}+{threads:<2}  '
+              f'ConcurrentQueue {items / linked:10.0f} items/s  '
+              f'queue.Queue {items / stdlib:10.0f} items/s')
+
+
+def copied_versions(items: list, versions: int) -> list:
+    """Return <versions> versions of a LinkedList of <items>, each a copy
+    of the one before with one more item pushed on the front.
+    """
+    result = [LinkedList(items)]
+    for i in range(versions - 1):
+        lst = LinkedList(result[-1])
+        lst.appendleft(i)
+        result.append(lst)
+    return result
+
+
+def persistent_versions(items: list, versions: int) -> list:
+    """Return <versions> versions of a PersistentList of <items>, each the
+    one before with one more item pushed on the front.
+    """
+    result = [PersistentList(items)]
+    for i in range(versions - 1):
+        result.append(result[-1].push(i))
+    return result
+
+
+def persistent_main() -> None:
+    """Print the memory used by 1000 versions of a list, kept as copied
+    LinkedLists and as PersistentLists that share their nodes.
+    """
+    versions = 1000
+    for n in (10 ** 2, 10 ** 3, 10 ** 4):
+        items = list(range(n))
+        copied = bytes_allocated(
+            lambda lst: copied_versions(lst, versions), items)
+        shared = bytes_allocated(
+            lambda lst: persistent_versions(lst, versions), items)
+        print(f'n={n:>6}  {versions} versions  '
+              f'copied LinkedList {copied / 2 ** 20:9.2f} MiB  '
+              f'PersistentList {shared / 2 ** 20:7.2f} MiB')
+
+
+def deque_ops(d: Any, n: int) -> float:
+    """Return the wall time, in seconds, of <n> appends, <n> appendlefts,
+    and then <n> pops and <n> poplefts on the empty deque-like <d>.
+    """
+    t0 = time.perf_counter()
+    for i in range(n):
+        d.append(i)
+        d.appendleft(i)
+    for _ in range(n):
+        d.pop()
+        d.popleft()
+    return time.perf_counter() - t0
+
+
+def deque_main() -> None:
+    """Print the throughput of DoublyLinkedList and collections.deque on
+    operations at both ends.
+    """
+    for n in (10 ** 4, 10 ** 5, 10 ** 6):
+        linked = deque_ops(DoublyLinkedList([]), n)
+        builtin = deque_ops(deque(), n)
+        print(f'n={n:>8}  DoublyLinkedList {4 * n / linked:10.0f} ops/s  '
+              f'collections.deque {4 * n / builtin:11.0f} ops/s')
+
+
+def skewed_keys(n: int, universe: int, s: float = 1.0) -> list:
+    """Return <n> keys from range(<universe>), where key k is drawn with
+    probability proportional to 1 / (k + 1) ** <s>, as in a Zipf
+    distribution.
+    """
+    weights = [1 / (k + 1) ** s for k in range(universe)]
+    return random.choices(range(universe), weights, k=n)
+
+
+def cached_calls(func: Callable[[Any], Any], keys: list) -> float:
+    """Return the wall time, in seconds, of calling <func> on each of
+    <keys>.
+    """
+    t0 = time.perf_counter()
+    for key in keys:
+        func(key)
+    return time.perf_counter() - t0
+
+
+def cache_main() -> None:
+    """Print the hit ratio and the time per call of LRUCache, LFUCache and
+    functools.lru_cache, for the same skewed stream of keys.
+    """
+    n = 10 ** 6
+    keys = skewed_keys(n, 10 ** 5)
+    for size in (100, 1000, 10000):
+        stdlib = lru_cache(maxsize=size)(abs)
+        seconds = cached_calls(stdlib, keys)
+        info = stdlib.cache_info()
+        print(f'size={size:>6}  functools.lru_cache  '
+              f'hit ratio {info.hits / n:.3f}  '
+              f'{seconds / n * 1e9:6.0f} ns/call')
+        for cls in (LRUCache, LFUCache):
+            func = cached(cls(max_size=size))(abs)
+            seconds = cached_calls(func, keys)
+            print(f'size={size:>6}  {cls.__name__:>19}  '
+                  f'hit ratio {func.cache.hit_ratio():.3f}  '
+                  f'{seconds / n * 1e9:6.0f} ns/call')
+
+
+def window_pushes(window: Any, values: list) -> float:
+    """Return the wall time, in seconds, of pushing each of <values> into
+    <window> with push (or append, for a RingBuffer).
+    """
+    push = window.append if isinstance(window, RingBuffer) else window.push
+    t0 = time.perf_counter()
+    for value in values:
+        push(value)
+    return time.perf_counter() - t0
+
+
+def window_main() -> None:
+    """Print the steady-state throughput of RingBuffer and SlidingWindow
+    at window sizes from 10**3 to 10**6, and the bytes each still holds
+    after another 10**5 pushes while full.
+    """
+    n = 10 ** 6
+    values = [random.random() for _ in range(n)]
+    for size in (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6):
+        ring = RingBuffer(values[:size], size)
+        window = SlidingWindow(size)
+        window_pushes(window, values[:size])
+        ring_time = window_pushes(ring, values)
+        window_time = window_pushes(window, values)
+        ring_bytes = bytes_allocated(
+            lambda lst: window_pushes(ring, lst), values[:10 ** 5])
+        window_bytes = bytes_allocated(
+            lambda lst: window_pushes(window, lst), values[:10 ** 5])
+        print(f'size={size:>8}  RingBuffer {n / ring_time:10.0f} items/s '
+              f'({ring_bytes} B)  SlidingWindow '
+              f'{n / window_time:10.0f} items/s ({window_bytes} B)')
+
+
+def queue_throughput(enqueue: Callable[[Any], Any],
+                     dequeue: Callable[[], Any], n: int,
+                     backlog: int) -> float:
+    """Return the wall time, in seconds, of passing <n> items through a
+    queue with the given <enqueue> and <dequeue> functions, keeping about
+    <backlog> items in it.
+    """
+    t0 = time.perf_counter()
+    for i in range(backlog):
+        enqueue(i)
+    for i in range(n - backlog):
+        enqueue(i)
+        dequeue()
+    for _ in range(backlog):
+        dequeue()
+    return time.perf_counter() - t0
+
+
+def queue_main() -> None:
+    """Print the throughput of queue_linked_list.Queue and
+    collections.deque when 10**7 items pass through them.
+    """
+    n = 10 ** 7
+    for backlog in (10, 10 ** 3, 10 ** 6):
+        q = Queue()
+        linked = queue_throughput(q.enqueue, q.dequeue, n, backlog)
+        d = deque()
+        builtin = queue_throughput(d.append, d.popleft, n, backlog)
+        print(f'{n} items, backlog={backlog:>8}  '
+              f'Queue {n / linked:10.0f} items/s  '
+              f'collections.deque {n / builtin:10.0f} items/s')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['memory']:
+        memory_main()
+    elif sys.argv[1:] == ['positional']:
+        positional_main()
+    elif sys.argv[1:] == ['chunks']:
+        chunks_main()
+    elif sys.argv[1:] == ['contention']:
+        contention_main()
+    elif sys.argv[1:] == ['persistent']:
+        persistent_main()
+    elif sys.argv[1:] == ['deque']:
+        deque_main()
+    elif sys.argv[1:] == ['cache']:
+        cache_main()
+    elif sys.argv[1:] == ['window']:
+        window_main()
+    elif sys.argv[1:] == ['queue']:
+        queue_main()
+    else:
+        print(__doc__)
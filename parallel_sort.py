@@ -0,0 +1,76 @@
+"""Parallel sorting
+
+=== Module Description ===
+This module sorts big lists on several cores. The list is cut into chunks,
+each chunk is sorted by timsort2 in its own process, and the sorted chunks
+are merged back together with a heap.
+
+Lists of plain ints or floats are sent to and from the worker processes as
+array.array buffers, which pickle as raw bytes instead of one object per
+item.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+from timsort import _numeric_typecode, merge_sorted, timsort2
+
+
+def parallel_sort(lst: list, workers: Optional[int] = None,
+                  chunk_size: Optional[int] = None) -> None:
+    """Sort <lst> in place, using <workers> processes.
+
+    <lst> is cut into chunks of <chunk_size> items (by default, one chunk per
+    worker), and each chunk is sorted with timsort2 in a worker process.
+    The sorted chunks are then merged in this process. <workers> defaults to
+    the number of CPUs. If there is only one worker or one chunk, <lst> is
+    sorted in this process.
+
+    The sort is stable. Items must be picklable.
+
+    >>> lst = [(i * 7919) % 1000 for i in range(1000)]
+    >>> parallel_sort(lst, workers=2, chunk_size=300)
+    >>> lst == list(range(1000))
+    True
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(lst) // workers))
+
+    if workers == 1 or len(lst) <= chunk_size:
+        timsort2(lst)
+        return
+
+    typecode = _numeric_typecode(lst)
+    chunks = []
+    for start in range(0, len(lst), chunk_size):
+        if typecode is None:
+            chunks.append(lst[start:start + chunk_size])
+        else:
+            chunks.append(array(typecode, lst[start:start + chunk_size]))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        sorted_chunks = list(executor.map(_sort_chunk, chunks))
+
+    # merge_sorted takes from earlier chunks first on ties, so the merge
+    # keeps the sort stable.
+    lst[:] = merge_sorted(sorted_chunks)
+
+
+def _sort_chunk(chunk: Union[list, array]) -> Union[list, array]:
+    """Return <chunk> sorted with timsort2.
+
+    This runs in a worker process. An array.array chunk is sorted as a list
+    and sent back as an array of the same type.
+
+    >>> _sort_chunk(array('q', [3, 1, 2]))
+    array('q', [1, 2, 3])
+    """
+    if isinstance(chunk, array):
+        items = chunk.tolist()
+        timsort2(items)
+        return array(chunk.typecode, items)
+    timsort2(chunk)
+    return chunk
@@ -0,0 +1,254 @@
+"""Persistent linked lists
+
+=== Module Description ===
+This module contains PersistentList, an immutable linked list. Instead of
+changing a list, push, pop, insert and set return a new version of it.
+The new version shares every node after the change with the old one, so
+taking a snapshot is free and old versions stay valid for as long as
+someone holds them.
+"""
+from __future__ import annotations
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from linked_list import LinkedList
+from recursive_list import RecursiveList
+
+
+class _Cons:
+    """A node in a PersistentList. Nodes are never changed once they are
+    linked into a list, since other versions may share them.
+
+    === Attributes ===
+    item:
+        The data stored in this node.
+    next:
+        The next node in the list, or None if there are no more nodes.
+    size:
+        The number of nodes from this one to the end of the list.
+    """
+    __slots__ = ('item', 'next', 'size')
+    item: Any
+    next: Optional[_Cons]
+    size: int
+
+    def __init__(self, item: Any, next: Optional[_Cons]) -> None:
+        """Initialize a new node storing <item>, followed by <next>.
+        """
+        self.item = item
+        self.next = next
+        self.size = 1 if next is None else next.size + 1
+
+
+class PersistentList:
+    """An immutable linked list, whose "mutating" methods return a new
+    version and leave this one unchanged.
+
+    A change at position i copies the i nodes before it, and shares the
+    rest, so push and pop(0) take O(1) time and memory.
+
+    >>> v1 = PersistentList([2, 3])
+    >>> v2 = v1.push(1)
+    >>> v3 = v2.set(2, 30)
+    >>> str(v1), str(v2), str(v3)
+    ('[2 -> 3]', '[1 -> 2 -> 3]', '[1 -> 2 -> 30]')
+    >>> v2._head.next is v1._head  # v2 shares all of v1's nodes
+    True
+    """
+    # === Private Attributes ===
+    # _head:
+    #     The first node in the list, or None if the list is empty.
+    _head: Optional[_Cons]
+
+    def __init__(self, items: Iterable = ()) -> None:
+        """Initialize a new list containing the given items.
+
+        <items> may be any iterable, including a LinkedList; see also
+        from_recursive_list.
+        """
+        self._head = _cons_all(list(items), None)
+
+    @classmethod
+    def _from_head(cls, head: Optional[_Cons]) -> PersistentList:
+        """Return a new list whose first node is <head>.
+        """
+        lst = cls()
+        lst._head = head
+        return lst
+
+    @classmethod
+    def from_recursive_list(cls, lst: RecursiveList) -> PersistentList:
+        """Return a new list containing the items of <lst>.
+
+        >>> str(PersistentList.from_recursive_list(RecursiveList([1, 2])))
+        '[1 -> 2]'
+        """
+        items = []
+        while not lst.is_empty():
+            items.append(lst._first)
+            lst = lst._rest
+        return cls(items)
+
+    def to_linked_list(self) -> LinkedList:
+        """Return a new LinkedList containing the items of this list.
+        """
+        return LinkedList(self)
+
+    def to_recursive_list(self) -> RecursiveList:
+        """Return a new RecursiveList containing the items of this list.
+
+        The RecursiveList is built from the end, one item at a time, so
+        long lists do not hit the recursion limit as RecursiveList(items)
+        would.
+
+        A RecursiveList uses a first item of None to mark the empty list,
+        so it cannot hold None. Raise ValueError if this list contains
+        None, rather than return a list that ends early.
+
+        >>> str(PersistentList([1, 2, 3]).to_recursive_list())
+        '1 -> 2 -> 3'
+        >>> PersistentList([1, None, 2]).to_recursive_list()
+        Traceback (most recent call last):
+        ValueError: a RecursiveList cannot hold None
+        """
+        items = list(self)
+        if any(item is None for item in items):
+            raise ValueError('a RecursiveList cannot hold None')
+        result = RecursiveList([])
+        for item in reversed(items):
+            rest = result
+            result = RecursiveList([])
+            result._first = item
+            result._rest = rest
+        return result
+
+    def is_empty(self) -> bool:
+        """Return whether this list is empty.
+        """
+        return self._head is None
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list, in constant time.
+        """
+        return 0 if self._head is None else self._head.size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list.
+        """
+        curr = self._head
+        while curr is not None:
+            yield curr.item
+            curr = curr.next
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+        """
+        return '[' + ' -> '.join(str(item) for item in self) + ']'
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+
+        Raise IndexError if index < 0 or index >= len(self).
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError
+        curr = self._head
+        for _ in range(index):
+            curr = curr.next
+        return curr.item
+
+    def count(self, item: Any) -> int:
+        """Return the number of times <item> occurs in this list.
+
+        Use == to compare items.
+        """
+        cnt = 0
+        for curr_item in self:
+            if item == curr_item:
+                cnt += 1
+        return cnt
+
+    def index(self, item: Any) -> int:
+        """Return the index of the first occurrence of <item> in this list.
+
+        Raise ValueError if the <item> is not present.
+
+        Use == to compare items.
+        """
+        for cnt, curr_item in enumerate(self):
+            if item == curr_item:
+                return cnt
+        raise ValueError
+
+    def push(self, item: Any) -> PersistentList:
+        """Return a new version of this list with <item> added to the front.
+
+        >>> str(PersistentList([2]).push(1))
+        '[1 -> 2]'
+        """
+        return self._from_head(_Cons(item, self._head))
+
+    def pop(self, index: int = 0) -> PersistentList:
+        """Return a new version of this list without the item at position
+        <index>.
+
+        Raise IndexError if index < 0 or index >= len(self).
+
+        >>> v1 = PersistentList([1, 2, 3])
+        >>> str(v1.pop()), str(v1.pop(1)), str(v1)
+        ('[2 -> 3]', '[1 -> 3]', '[1 -> 2 -> 3]')
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError
+        prefix, curr = self._split(index)
+        return self._from_head(_cons_all(prefix, curr.next))
+
+    def insert(self, index: int, item: Any) -> PersistentList:
+        """Return a new version of this list with <item> inserted at
+        position <index>.
+
+        Raise IndexError if index < 0 or index > len(self).
+
+        >>> str(PersistentList([1, 3]).insert(1, 2))
+        '[1 -> 2 -> 3]'
+        """
+        if index < 0 or index > len(self):
+            raise IndexError
+        prefix, curr = self._split(index)
+        return self._from_head(_cons_all(prefix, _Cons(item, curr)))
+
+    def set(self, index: int, item: Any) -> PersistentList:
+        """Return a new version of this list with the item at position
+        <index> replaced by <item>.
+
+        Raise IndexError if index < 0 or index >= len(self).
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError
+        prefix, curr = self._split(index)
+        return self._from_head(_cons_all(prefix, _Cons(item, curr.next)))
+
+    def _split(self, index: int) -> Tuple[List[Any], Optional[_Cons]]:
+        """Return the first <index> items of this list, and the node at
+        position <index> (None if index == len(self)).
+        """
+        prefix = []
+        curr = self._head
+        for _ in range(index):
+            prefix.append(curr.item)
+            curr = curr.next
+        return prefix, curr
+
+
+def _cons_all(items: List[Any], tail: Optional[_Cons]) -> Optional[_Cons]:
+    """Return the first of new nodes holding <items>, in order, followed by
+    <tail> (which is shared, not copied).
+    """
+    for item in reversed(items):
+        tail = _Cons(item, tail)
+    return tail
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
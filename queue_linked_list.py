@@ -1,9 +1,22 @@
-from linked_list import _Node, LinkedList
-from typing import List, Any, Optional
+from linked_list import LinkedList
+from typing import List, Any, Iterable, Optional
 
 class Queue:
     """
     This is a queue implemented using linked list
+
+    Items are appended at the end of the linked list and popped from the
+    front, so enqueue, dequeue, peek and len all take O(1) time, and a
+    dequeued node is unlinked from the list.
+
+    >>> q = Queue()
+    >>> q.enqueue_many([1, 2, 3, 4])
+    >>> len(q), q.peek()
+    (4, 1)
+    >>> q.drain(3)
+    [1, 2, 3]
+    >>> q.drain()
+    [4]
     """
     def __init__(self):
         self.item = LinkedList([])
@@ -14,15 +27,29 @@ class Queue:
         """
         return self.item.is_empty()
 
+    def __len__(self) -> int:
+        """Return the number of items in this queue.
+        """
+        return len(self.item)
+
     def enqueue(self, item: Any):
         """Add <item> to the back of this queue.
         """
-        tmp = None
-        if not self.is_empty():
-            tmp = self.item._first
-        self.item._first = _Node(item)
-        if tmp is not None:
-            self.item._first.next = tmp
+        self.item.append(item)
+
+    def enqueue_many(self, items: Iterable):
+        """Add the items of <items> to the back of this queue, in order.
+        """
+        self.item.extend(items)
+
+    def peek(self) -> Optional[Any]:
+        """Return the item at the front of this queue without removing it.
+
+        Return None if this Queue is empty.
+        """
+        if self.item.is_empty():
+            return None
+        return self.item[0]
 
     def dequeue(self) -> Optional[Any]:
         """Remove and return the item at the front of this queue.
@@ -35,13 +62,22 @@ class Queue:
         >>> q.enqueue('goodbye')
         >>> q.dequeue()
         'hello'
+        >>> q.dequeue()
+        'goodbye'
+        >>> q.dequeue() is None
+        True
+        """
+        if self.item.is_empty():
+            return None
+        return self.item.pop(0)
+
+    def drain(self, n: Optional[int] = None) -> List[Any]:
+        """Remove and return up to <n> items from the front of this queue,
+        in order, or all of them if <n> is None.
         """
-        curr = self.item._first
-        while curr.next is not None:
-            curr = curr.next
-        tmp = curr.item
-        curr.item = None
-        return tmp
+        if n is None or n > len(self.item):
+            n = len(self.item)
+        return self.item.delete_many(range(n))
 
 
 if __name__ == '__main__':
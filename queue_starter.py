@@ -1,17 +1,52 @@
 from typing import Any, List, Optional
 
 
+# The smallest capacity of a Queue's buffer; must be a power of two.
+MIN_CAPACITY = 8
+
+
 class Queue:
     """A first-in-first-out (FIFO) queue of items.
 
     Stores data in a first-in, first-out order. When removing an item from the
-    queue, the most recently-added item is the one that is removed.
+    queue, the least recently-added item is the one that is removed.
+
+    The items are kept in a circular buffer: a list whose length is a power
+    of two, with the front of the queue at index _head and the back just
+    before index _tail, wrapping around the end of the list. enqueue and
+    dequeue take amortized O(1) time. The buffer doubles when it is full,
+    and halves when it is at most a quarter full.
+
+    >>> q = Queue()
+    >>> for i in range(20):
+    ...     q.enqueue(i)
+    >>> [q.dequeue() for _ in range(18)][-1], len(q._items)
+    (17, 8)
     """
+    # === Private Attributes ===
+    # _items:
+    #     The circular buffer. Slots that hold no item hold None.
+    # _head:
+    #     The index in _items of the front item.
+    # _tail:
+    #     The index in _items where the next item will be added.
+    # _size:
+    #     The number of items in the queue.
     _items: List
+    _head: int
+    _tail: int
+    _size: int
+
+    # === Representation Invariants ===
+    # len(_items) is a power of two, and at least MIN_CAPACITY.
+    # _tail == (_head + _size) % len(_items)
 
     def __init__(self) -> None:
         """Initialize a new empty queue."""
-        self._items = []
+        self._items = [None] * MIN_CAPACITY
+        self._head = 0
+        self._tail = 0
+        self._size = 0
 
     def is_empty(self) -> bool:
         """Return whether this queue contains no items.
@@ -23,12 +58,17 @@ class Queue:
         >>> q.is_empty()
         False
         """
-        return self._items == []
+        return self._size == 0
 
     def enqueue(self, item: Any) -> None:
         """Add <item> to the back of this queue.
         """
-        self._items.append(item)
+        if self._size == len(self._items):
+            self._resize(2 * len(self._items))
+        self._items[self._tail] = item
+        # len(self._items) is a power of two, so the mask wraps the index.
+        self._tail = (self._tail + 1) & (len(self._items) - 1)
+        self._size += 1
 
     def dequeue(self) -> Optional[Any]:
         """Remove and return the item at the front of this queue.
@@ -42,20 +82,52 @@ class Queue:
         >>> q.dequeue()
         'hello'
         """
-        return self._items.pop(0)
+        if self._size == 0:
+            return None
+        item = self._items[self._head]
+        self._items[self._head] = None
+        self._head = (self._head + 1) & (len(self._items) - 1)
+        self._size -= 1
+        if len(self._items) > MIN_CAPACITY and \
+                self._size <= len(self._items) // 4:
+            self._resize(len(self._items) // 2)
+        return item
 
     def reverse_and_remove_odds(self) -> None:
         """
         Reverse the order of items in the queue and remove odd numbers
+
+        >>> q = Queue()
+        >>> for i in range(1, 7):
+        ...     q.enqueue(i)
+        >>> q.reverse_and_remove_odds()
+        >>> [q.dequeue() for _ in range(3)], q.is_empty()
+        ([6, 4, 2], True)
         """
-        self._reverse_and_remove_odds_helper(self.dequeue())
-        return
+        evens = [item for item in reversed(self._in_order()) if item % 2 == 0]
+        capacity = MIN_CAPACITY
+        while capacity < len(evens):
+            capacity *= 2
+        self._items = evens + [None] * (capacity - len(evens))
+        self._head = 0
+        self._size = len(evens)
+        self._tail = self._size & (capacity - 1)
 
-    def _reverse_and_remove_odds_helper(self, item) -> None:
+    def _in_order(self) -> List:
+        """Return a new list of the items in this queue, front to back.
+        """
+        end = self._head + self._size
+        if end <= len(self._items):
+            return self._items[self._head:end]
+        return self._items[self._head:] + self._items[:end - len(self._items)]
 
-        if self.is_empty():
-            return
-        self._reverse_and_remove_odds_helper(self.dequeue())
-        if item % 2 == 0:
-            self.enqueue(item)
-        return
+    def _resize(self, capacity: int) -> None:
+        """Move the items of this queue into a new buffer of <capacity>
+        slots, starting at index 0.
+
+        Precondition: capacity is a power of two, and capacity > _size.
+        """
+        items = self._in_order()
+        self._items = items + [None] * (capacity - len(items))
+        self._head = 0
+        self._tail = self._size
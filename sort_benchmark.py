@@ -0,0 +1,334 @@
+"""Sorting benchmarks
+
+=== Module Description ===
+This module times the sorting algorithms in this repository against each
+other. Run it directly:
+
+    python sort_benchmark.py
+    python sort_benchmark.py parallel
+    python sort_benchmark.py suite [results.json [max_n]]
+    python sort_benchmark.py compare old.json new.json
+
+The suite runs every algorithm in ALGORITHMS on every input in GENERATORS
+and writes the results as JSON, so that two versions of the code can be
+compared with "compare".
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from in_place_quicksort import in_place_quicksort
+from parallel_sort import parallel_sort
+from timsort import find_runs2, mergesort2, run_stats, timsort, timsort2
+
+
+def partially_sorted(n: int, run_length: int = 1000,
+                     noise: float = 0.01) -> List[float]:
+    """Return a list of <n> floats that looks like a batch of telemetry:
+    sorted blocks of <run_length> timestamps, with a small fraction
+    (<noise>) of items out of place.
+    """
+    lst = []
+    base = 0.0
+    while len(lst) < n:
+        block = sorted(base + random.random() * run_length
+                       for _ in range(min(run_length, n - len(lst))))
+        lst.extend(block)
+        base += run_length * 0.9  # neighbouring blocks overlap a little
+    for _ in range(int(n * noise)):
+        i = random.randrange(n)
+        j = random.randrange(n)
+        lst[i], lst[j] = lst[j], lst[i]
+    return lst
+
+
+################################################################################
+# Input generators
+################################################################################
+def random_input(n: int) -> List[int]:
+    """Return <n> random ints in range(n).
+    """
+    return [random.randrange(n) for _ in range(n)]
+
+
+def sorted_input(n: int) -> List[int]:
+    """Return range(n) as a list.
+    """
+    return list(range(n))
+
+
+def reversed_input(n: int) -> List[int]:
+    """Return range(n) in decreasing order.
+    """
+    return list(range(n - 1, -1, -1))
+
+
+def organ_pipe(n: int) -> List[int]:
+    """Return <n> ints that rise to a peak in the middle, then fall again.
+
+    >>> organ_pipe(7)
+    [0, 1, 2, 3, 2, 1, 0]
+    """
+    return [min(i, n - 1 - i) for i in range(n)]
+
+
+def few_unique(n: int, values: int = 10) -> List[int]:
+    """Return <n> random ints, with only <values> distinct values.
+    """
+    return [random.randrange(values) for _ in range(n)]
+
+
+def sawtooth(n: int, teeth: int = 10) -> List[int]:
+    """Return <n> ints made of <teeth> equal-length ascending runs.
+
+    >>> sawtooth(6, 2)
+    [0, 1, 2, 0, 1, 2]
+    """
+    period = max(1, n // teeth)
+    return [i % period for i in range(n)]
+
+
+def many_small_runs(n: int, run_length: int = 8) -> List[int]:
+    """Return <n> random ints, arranged in sorted runs of <run_length>.
+    """
+    lst = random_input(n)
+    for i in range(0, n, run_length):
+        lst[i:i + run_length] = sorted(lst[i:i + run_length])
+    return lst
+
+
+def sorted_random_tail(n: int, tail: float = 0.1) -> List[int]:
+    """Return <n> ints: a sorted list with its last <tail> fraction
+    replaced by random items, like a sorted table with new rows appended.
+    """
+    k = int(n * tail)
+    return list(range(n - k)) + [random.randrange(n) for _ in range(k)]
+
+
+GENERATORS: Dict[str, Callable[[int], list]] = {
+    'random': random_input,
+    'sorted': sorted_input,
+    'reversed': reversed_input,
+    'organ_pipe': organ_pipe,
+    'few_unique': few_unique,
+    'sawtooth': sawtooth,
+    'many_small_runs': many_small_runs,
+    'sorted_random_tail': sorted_random_tail
+}
+
+
+################################################################################
+# Measurements
+################################################################################
+def time_sort(sort: Callable[[list], None], lst: list,
+              repeat: int = 3) -> float:
+    """Return the best wall time, in seconds, of sorting a copy of <lst>
+    with <sort> <repeat> times.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        copy = lst[:]
+        t0 = time.perf_counter()
+        sort(copy)
+        best = min(best, time.perf_counter() - t0)
+        assert copy == sorted(lst)
+    return best
+
+
+def peak_memory(sort: Callable[[list], None], lst: list) -> int:
+    """Return the peak number of bytes allocated while sorting a copy of
+    <lst> with <sort>, as measured by tracemalloc.
+    """
+    copy = lst[:]
+    tracemalloc.start()
+    sort(copy)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+class _CountedKey:
+    """A key that counts how many times it is compared.
+
+    Sorting with key=_CountedKey.factory(counter) counts every comparison
+    the sort makes in counter[0]. Only < and <= are counted; between them
+    they are all the sorts in this repository use.
+    """
+    __slots__ = ('value', 'counter')
+
+    def __init__(self, value: Any, counter: List[int]) -> None:
+        self.value = value
+        self.counter = counter
+
+    @staticmethod
+    def factory(counter: List[int]) -> Callable[[Any], '_CountedKey']:
+        """Return a key function that wraps items in _CountedKeys sharing
+        <counter>.
+        """
+        return lambda item: _CountedKey(item, counter)
+
+    def __lt__(self, other: '_CountedKey') -> bool:
+        self.counter[0] += 1
+        return self.value < other.value
+
+    def __le__(self, other: '_CountedKey') -> bool:
+        self.counter[0] += 1
+        return self.value <= other.value
+
+    def __gt__(self, other: '_CountedKey') -> bool:
+        self.counter[0] += 1
+        return self.value > other.value
+
+    def __ge__(self, other: '_CountedKey') -> bool:
+        self.counter[0] += 1
+        return self.value >= other.value
+
+
+def count_comparisons(sort: Callable[..., None], lst: list) -> int:
+    """Return the number of comparisons <sort> makes to sort a copy of
+    <lst>. <sort> must accept a key argument.
+
+    >>> count_comparisons(_builtin_sort, [2, 1])
+    1
+    """
+    counter = [0]
+    copy = lst[:]
+    sort(copy, key=_CountedKey.factory(counter))
+    return counter[0]
+
+
+################################################################################
+# Benchmark suite
+################################################################################
+def _builtin_sort(lst: list, key: Optional[Callable[[Any], Any]] = None) \
+        -> None:
+    """Sort <lst> with the builtin sorted, in place like the other sorts.
+    """
+    lst[:] = sorted(lst, key=key)
+
+
+ALGORITHMS: Dict[str, Callable[..., None]] = {
+    'mergesort2': mergesort2,
+    'timsort': timsort,
+    'timsort2': timsort2,
+    'in_place_quicksort': in_place_quicksort,
+    'sorted': _builtin_sort
+}
+# The Task 2 timsort merges its runs in a quadratic order, so it is only run
+# up to this size.
+TIMSORT_MAX_N = 10 ** 5
+# Counting comparisons wraps every item in a Python object, so it is only
+# done up to this size.
+COUNT_MAX_N = 10 ** 5
+SIZES = [10 ** k for k in range(2, 8)]
+
+
+def run_suite(max_n: int = SIZES[-1]) -> List[Dict[str, Any]]:
+    """Run every algorithm in ALGORITHMS on every input in GENERATORS, at
+    every size in SIZES up to <max_n>, and return one result per run.
+
+    Each result records the algorithm, input and size, the best wall time
+    in seconds, the number of comparisons (None above COUNT_MAX_N), and
+    the peak bytes allocated. It also records 'runs', the run_stats of the
+    input, so that timings can be read against how presorted the input
+    was.
+    """
+    results = []
+    for n in SIZES:
+        if n > max_n:
+            break
+        for input_name, generate in GENERATORS.items():
+            lst = generate(n)
+            # find_runs2 reverses descending runs in place, so use a copy.
+            runs = run_stats(find_runs2(lst[:]))
+            for name, sort in ALGORITHMS.items():
+                if name == 'timsort' and n > TIMSORT_MAX_N:
+                    continue
+                result = {'algorithm': name, 'input': input_name, 'n': n,
+                          'seconds': time_sort(sort, lst,
+                                               repeat=3 if n < 10 ** 6
+                                               else 1),
+                          'comparisons': count_comparisons(sort, lst)
+                          if n <= COUNT_MAX_N else None,
+                          'peak_bytes': peak_memory(sort, lst),
+                          'runs': runs}
+                results.append(result)
+                print(f'{name:>18} {input_name:>18} n={n:<8} '
+                      f'{result["seconds"]:9.4f}s', file=sys.stderr)
+    return results
+
+
+def compare_results(old: List[Dict[str, Any]],
+                    new: List[Dict[str, Any]]) -> None:
+    """Print how the wall time and comparison count of every run in <new>
+    changed from the same run in <old>.
+    """
+    before = {(r['algorithm'], r['input'], r['n']): r for r in old}
+    for r in new:
+        o = before.get((r['algorithm'], r['input'], r['n']))
+        if o is None:
+            continue
+        line = (f'{r["algorithm"]:>18} {r["input"]:>18} n={r["n"]:<8} '
+                f'time {r["seconds"] / o["seconds"]:6.2f}x')
+        if r['comparisons'] is not None and o['comparisons']:
+            ratio = r['comparisons'] / o['comparisons']
+            line += f'  comparisons {ratio:6.2f}x'
+        print(line)
+
+
+def main() -> None:
+    """Print timings and peak memory of timsort2 and mergesort2 on
+    partially sorted input.
+    """
+    for n in (10 ** 4, 10 ** 5, 10 ** 6):
+        lst = partially_sorted(n)
+        merge_time = time_sort(mergesort2, lst)
+        tim_time = time_sort(timsort2, lst)
+        print(f'n={n:>8}  mergesort2 {merge_time:8.3f}s '
+              f'{peak_memory(mergesort2, lst) // 1024:>7} KiB  '
+              f'timsort2 {tim_time:8.3f}s '
+              f'{peak_memory(timsort2, lst) // 1024:>7} KiB  '
+              f'speedup {merge_time / tim_time:5.1f}x')
+
+
+def parallel_main() -> None:
+    """Print timings of parallel_sort with 1, 2, 4 and 8 workers against
+    single-process timsort2 on random floats.
+    """
+    for n in (10 ** 6, 10 ** 7):
+        lst = [random.random() for _ in range(n)]
+        base = time_sort(timsort2, lst, repeat=1)
+        print(f'n={n:>8}  timsort2 {base:8.3f}s')
+        for workers in (1, 2, 4, 8):
+            t = time_sort(lambda items: parallel_sort(items, workers), lst,
+                          repeat=1)
+            print(f'{"":>10}  parallel_sort workers={workers} {t:8.3f}s  '
+                  f'speedup {base / t:5.1f}x')
+
+
+def suite_main(args: List[str]) -> None:
+    """Run the benchmark suite and write its results as JSON to args[0]
+    (by default, stdout), for sizes up to int(args[1]).
+    """
+    max_n = int(args[1]) if len(args) > 1 else SIZES[-1]
+    results = run_suite(max_n)
+    if args:
+        with open(args[0], 'w') as f:
+            json.dump(results, f, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['parallel']:
+        parallel_main()
+    elif sys.argv[1:2] == ['suite']:
+        suite_main(sys.argv[2:])
+    elif sys.argv[1:2] == ['compare'] and len(sys.argv) == 4:
+        with open(sys.argv[2]) as old_file, open(sys.argv[3]) as new_file:
+            compare_results(json.load(old_file), json.load(new_file))
+    else:
+        main()
@@ -0,0 +1,361 @@
+"""Sorted linked lists
+
+=== Module Description ===
+This module contains SortedLinkedList, a linked list whose items are always
+in non-decreasing order, and merge_sort, which sorts any LinkedList in
+place.
+
+Both work by relinking the existing _Nodes rather than copying items:
+merging two sorted lists allocates no new nodes, and merge_sort uses O(1) extra
+space.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from linked_list import LinkedList, _Node
+
+
+def merge_sort(lst: LinkedList) -> None:
+    """Sort <lst> in non-decreasing order, in place, by relinking its nodes.
+
+    This is a bottom-up merge sort: sorted runs of width 1, 2, 4, ... are
+    merged in pairs, left to right, so there is no recursion and only O(1)
+    extra space. The sort is stable.
+
+    >>> lst = LinkedList([3, 1, 2, 5, 4])
+    >>> merge_sort(lst)
+    >>> str(lst), lst._last.item
+    ('[1 -> 2 -> 3 -> 4 -> 5]', 5)
+    """
+    n = len(lst)
+    if n < 2:
+        return
+    head = _Node(None)  # A placeholder in front of the first node
+    head.next = lst._first
+    tail = head
+    width = 1
+    while width < n:
+        tail = head
+        curr = head.next
+        while curr is not None:
+            left = curr
+            right = _split(left, width)
+            curr = _split(right, width)
+            tail = _merge_after(tail, left, right)
+        width *= 2
+    lst._first = head.next
+    lst._last = tail
+
+
+def _split(first: Optional[_Node], n: int) -> Optional[_Node]:
+    """Cut the chain of nodes starting at <first> after its <n>th node, and
+    return the first node of the rest of it (None if there is none).
+    """
+    curr = first
+    for _ in range(n - 1):
+        if curr is None:
+            return None
+        curr = curr.next
+    if curr is None:
+        return None
+    rest = curr.next
+    curr.next = None
+    return rest
+
+
+def _merge_after(tail: _Node, first1: Optional[_Node],
+                 first2: Optional[_Node]) -> _Node:
+    """Merge the sorted chains starting at <first1> and <first2> by
+    relinking their nodes, link the result after <tail>, and return the
+    last node of the result (<tail>, if both chains are empty).
+
+    Nodes of the first chain go before equal nodes of the second, so the
+    merge is stable.
+    """
+    while first1 is not None and first2 is not None:
+        if first2.item < first1.item:
+            tail.next = first2
+            first2 = first2.next
+        else:
+            tail.next = first1
+            first1 = first1.next
+        tail = tail.next
+    tail.next = first1 if first1 is not None else first2
+    while tail.next is not None:
+        tail = tail.next
+    return tail
+
+
+class SortedLinkedList:
+    """A linked list whose items are always in non-decreasing order.
+
+    Items are added with add, extend or merge, and removed with remove,
+    pop, remove_where or delete_many; there is no way to put an item at a
+    chosen position, so this is not a LinkedList, but wraps one.
+
+    Equal items stay in the order they were added.
+
+    >>> lst = SortedLinkedList([5, 1, 3])
+    >>> lst.add(2)
+    >>> str(lst)
+    '[1 -> 2 -> 3 -> 5]'
+    >>> lst.merge(SortedLinkedList([0, 4]))
+    >>> str(lst)
+    '[0 -> 1 -> 2 -> 3 -> 4 -> 5]'
+    """
+    # === Private Attributes ===
+    # _list:
+    #     The items, in non-decreasing order. Nodes are linked into it
+    #     directly, as in merge_sort.
+    _list: LinkedList
+
+    def __init__(self, items: Iterable = ()) -> None:
+        """Initialize a new sorted list containing the given items.
+        """
+        self._list = LinkedList([])
+        self.extend(items)
+
+    def is_empty(self) -> bool:
+        """Return whether this list is empty.
+        """
+        return self._list.is_empty()
+
+    def __len__(self) -> int:
+        """Return the number of items in this list.
+        """
+        return len(self._list)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, smallest first.
+        """
+        return iter(self._list)
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Return an iterator over the items of this list, largest first.
+        """
+        return reversed(self._list)
+
+    def __str__(self) -> str:
+        """Return a string representation of this list in the form
+        '[item1 -> item2 -> ... -> item-n]'.
+        """
+        return str(self._list)
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the item at position <index> in this list.
+
+        Raise IndexError if <index> is >= the length of this list.
+        """
+        return self._list[index]
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether <item> is in this list.
+
+        The walk stops at the first item greater than <item>.
+        """
+        for curr_item in self._list:
+            if item < curr_item:
+                return False
+            if not curr_item < item:
+                return True
+        return False
+
+    def count(self, item: Any) -> int:
+        """Return the number of times <item> occurs in this list.
+        """
+        return self._list.count(item)
+
+    def index(self, item: Any) -> int:
+        """Return the index of the first occurrence of <item> in this list.
+
+        Raise ValueError if the <item> is not present.
+        """
+        return self._list.index(item)
+
+    def add(self, item: Any) -> None:
+        """Insert <item> into this list, after any items equal to it.
+
+        >>> lst = SortedLinkedList([1, 3])
+        >>> lst.add(2)
+        >>> lst.add(4)
+        >>> str(lst), lst._list._last.item
+        ('[1 -> 2 -> 3 -> 4]', 4)
+        """
+        chain = self._list
+        new_node = _Node(item)
+        if chain._first is None or item < chain._first.item:
+            new_node.next = chain._first
+            chain._first = new_node
+        else:
+            curr = chain._first
+            while curr.next is not None and not item < curr.next.item:
+                curr = curr.next
+            curr.next, new_node.next = new_node, curr.next
+        if new_node.next is None:
+            chain._last = new_node
+        chain._size += 1
+
+    def extend(self, items: Iterable) -> None:
+        """Add the items of <items> to this list.
+
+        The items are linked into a new chain, which is sorted with
+        merge_sort and then merged into this list, so this takes
+        O(n log n) time for n new items rather than O(n) per item.
+        """
+        chain = LinkedList(items)
+        merge_sort(chain)
+        self._merge_chain(chain)
+
+    def merge(self, other: SortedLinkedList) -> None:
+        """Move every item of <other> into this list, in O(n) time, by
+        relinking nodes. <other> is left empty.
+
+        Items of this list go before equal items of <other>.
+        """
+        if other is not self:
+            self._merge_chain(other._list)
+
+    def _merge_chain(self, other: LinkedList) -> None:
+        """Merge the nodes of <other>, which must be sorted, into this list,
+        and leave <other> empty.
+        """
+        if other.is_empty():
+            return
+        chain = self._list
+        head = _Node(None)
+        chain._last = _merge_after(head, chain._first, other._first)
+        chain._first = head.next
+        chain._size += other._size
+        other._first = None
+        other._last = None
+        other._size = 0
+
+    def remove(self, item: Any) -> None:
+        """Remove the first occurrence of <item> from this list.
+
+        Raise ValueError if the <item> is not present.
+
+        >>> lst = SortedLinkedList([1, 2, 2, 3])
+        >>> lst.remove(2)
+        >>> str(lst)
+        '[1 -> 2 -> 3]'
+        """
+        self._list.pop(self._list.index(item))
+
+    def pop(self, index: int) -> Any:
+        """Remove the item at position <index> from this list, and return
+        it.
+
+        Raise IndexError if index < 0 or index >= len(self).
+        """
+        return self._list.pop(index)
+
+    def remove_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every item of this list for which <predicate> returns
+        True, and return the number of items removed.
+        """
+        return self._list.remove_where(predicate)
+
+    def delete_many(self, indices: Iterable[int]) -> List[Any]:
+        """Remove the items at the positions in <indices> from this list,
+        and return them in order; see LinkedList.delete_many.
+        """
+        return self._list.delete_many(indices)
+
+    def union(self, other: SortedLinkedList) -> SortedLinkedList:
+        """Return a new sorted list of the distinct items that are in this
+        list, in <other>, or in both.
+
+        >>> str(SortedLinkedList([1, 2, 2, 4]).union(SortedLinkedList([2, 3])))
+        '[1 -> 2 -> 3 -> 4]'
+        """
+        return self._combine(other, True, True, True)
+
+    def intersection(self, other: SortedLinkedList) -> SortedLinkedList:
+        """Return a new sorted list of the distinct items that are in both
+        this list and <other>.
+
+        >>> lst = SortedLinkedList([1, 2, 2, 4])
+        >>> str(lst.intersection(SortedLinkedList([2, 3, 4])))
+        '[2 -> 4]'
+        """
+        return self._combine(other, False, True, False)
+
+    def difference(self, other: SortedLinkedList) -> SortedLinkedList:
+        """Return a new sorted list of the distinct items that are in this
+        list but not in <other>.
+
+        >>> lst = SortedLinkedList([1, 2, 2, 4])
+        >>> str(lst.difference(SortedLinkedList([2, 3])))
+        '[1 -> 4]'
+        """
+        return self._combine(other, True, False, False)
+
+    def _combine(self, other: SortedLinkedList, only_self: bool,
+                 both: bool, only_other: bool) -> SortedLinkedList:
+        """Return a new sorted list of the distinct items that are only in
+        this list (if <only_self>), in both lists (if <both>) and only in
+        <other> (if <only_other>).
+
+        Both lists are walked once, side by side, so this takes
+        O(len(self) + len(other)) time.
+        """
+        result = SortedLinkedList()
+        # The items come out sorted, so they can be appended as they are.
+        result._list.extend(_set_op_items(self._list, other._list, only_self,
+                                          both, only_other))
+        return result
+
+
+def _set_op_items(lst1: LinkedList, lst2: LinkedList, only1: bool,
+                  both: bool, only2: bool) -> Iterator[Any]:
+    """Yield, in sorted order, the distinct items that are only in sorted
+    list <lst1> (if <only1>), in both (if <both>) and only in sorted list
+    <lst2> (if <only2>).
+    """
+    items1 = _distinct(iter(lst1))
+    items2 = _distinct(iter(lst2))
+    item1 = next(items1, _END)
+    item2 = next(items2, _END)
+    while item1 is not _END and item2 is not _END:
+        if item1 < item2:
+            if only1:
+                yield item1
+            item1 = next(items1, _END)
+        elif item2 < item1:
+            if only2:
+                yield item2
+            item2 = next(items2, _END)
+        else:
+            if both:
+                yield item1
+            item1 = next(items1, _END)
+            item2 = next(items2, _END)
+    if item1 is not _END and only1:
+        yield item1
+        yield from items1
+    if item2 is not _END and only2:
+        yield item2
+        yield from items2
+
+
+# Marks the end of an iterator in _set_op_items, since None may be an item.
+_END = object()
+
+
+def _distinct(items: Iterator[Any]) -> Iterator[Any]:
+    """Yield the items of sorted <items>, skipping any item equal to the
+    one before it.
+    """
+    first = True
+    prev = None
+    for item in items:
+        if first or prev < item:
+            yield item
+        first = False
+        prev = item
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,4 @@
-from linked_list import _Node, LinkedList
+from linked_list import LinkedList
 from typing import List, Any, Optional
 
 
@@ -22,12 +22,7 @@ class Stack:
 
     def push(self, item: Any):
         """Add a new element to the top of this stack."""
-        tmp = None
-        if not self.is_empty():
-            tmp = self.item._first
-        self.item._first = _Node(item)
-        if tmp is not None:
-            self.item._first.next = tmp
+        self.item.appendleft(item)
 
     def pop(self) -> Optional[Any]:
         """Remove and return the element at the top of this stack.
@@ -42,9 +37,7 @@ class Stack:
         """
         if self.item.is_empty():
             raise EmptyStackError
-        tmp = self.item._first.item
-        self.item._first = self.item._first.next
-        return tmp
+        return self.item.pop(0)
 
 
 if __name__ == '__main__':